@@ -0,0 +1,192 @@
+# Evaluator dashboard: review the answers candidates submitted to the answer
+# store (INTERVIEW_ANSWER_STORE), with transcripts and scores where
+# transcribe.py and scoring.py have run.
+# Needs an "evaluator" password in Streamlit Secrets.
+# Run with: streamlit run Evaluator.py
+import math
+import os
+
+import streamlit as st
+
+import scoring
+import thumbnails
+import transcribe
+from answer_store import get_answer_store, parse_answer_key
+from auth import get_evaluator_password, login_blocked, try_login
+from media_server import media_enabled, media_url
+from question_bank import list_sessions, load_questions, session_title
+
+# --- CONFIGURATION ---
+CANDIDATES_PER_PAGE = 20
+# Seconds before the store is listed again
+INDEX_TTL = 60
+
+
+@st.cache_resource(ttl=INDEX_TTL)
+def answer_index():
+    """Lists the store: {session: {candidate: ((q_index, key, version), ...)}}.
+
+    Only key names are read, no answer data. The result is shared by every
+    evaluator and never copied, so paging through it costs nothing.
+    """
+    index = {}
+    for key, version in get_answer_store().list_answers():
+        candidate, session, q_index = parse_answer_key(key)
+        index.setdefault(session, {}).setdefault(candidate, []).append((q_index, key, version))
+    return {
+        session: {candidate: tuple(sorted(answers)) for candidate, answers in sorted(candidates.items())}
+        for session, candidates in index.items()
+    }
+
+
+def require_evaluator_login():
+    """Shows the evaluator login and stops the script until the password is right."""
+    if st.session_state.get("evaluator_authenticated"):
+        return
+    expected = get_evaluator_password()
+    if expected is None:
+        st.error("Set an 'evaluator' password in Streamlit Secrets to use this page.")
+        st.stop()
+    if login_blocked():
+        st.error("⛔ Too many login attempts. Please wait a minute and try again.")
+        st.stop()
+
+    st.title("🔒 Evaluator Access")
+    password_input = st.text_input("Enter Password:", type="password")
+    if st.button("Login 🔐"):
+        if try_login(password_input, expected):
+            st.session_state.evaluator_authenticated = True
+            st.rerun()
+        else:
+            st.error("❌ Incorrect Password. Please try again.")
+    st.stop()
+
+
+def open_review(session, candidate):
+    st.session_state.review = (session, candidate)
+    st.session_state.playing = None
+
+
+def close_review():
+    st.session_state.review = None
+
+
+def start_playing(key):
+    st.session_state.playing = key
+
+
+def candidate_list(session, candidates, question_count):
+    """One page of candidates, filtered by the search box."""
+    search = st.sidebar.text_input("Search candidates").strip().lower()
+    names = [name for name in candidates if search in name]
+    pages = max(1, math.ceil(len(names) / CANDIDATES_PER_PAGE))
+    page = st.sidebar.number_input("Page", min_value=1, max_value=pages, value=1)
+    st.caption(f"{len(names)} candidates · page {page} of {pages}")
+
+    start = (page - 1) * CANDIDATES_PER_PAGE
+    for name in names[start:start + CANDIDATES_PER_PAGE]:
+        name_col, count_col, button_col = st.columns([4, 2, 1])
+        name_col.write(f"**{name}**")
+        count_col.write(f"{len(candidates[name])}/{question_count} answers")
+        button_col.button("Review", key=f"review_{session}_{name}", on_click=open_review, args=(session, name))
+
+
+def play_answer(store, key):
+    """Streams one answer; only ever called for the answer the evaluator opened.
+
+    S3 answers play from a presigned URL and local ones from the media
+    server, so the file is never loaded into this process. Without the
+    media server, Streamlit serves the local file itself.
+    """
+    player = st.audio if thumbnails.is_audio_answer(key) else st.video
+    url = store.playback_url(key)
+    if url is None:
+        path = store.path_for(key)
+        url = media_url(path) if media_enabled() else path
+    player(url)
+
+
+def show_thumbnails(store, key, version):
+    """Poster and preview strip of a video answer, made in the background on first view."""
+    if not thumbnails.thumbnails_available():
+        return
+    images = thumbnails.for_stored(store, key, version)
+    if images is not None:
+        poster, strip = images
+        poster_col, strip_col = st.columns([1, 3])
+        poster_col.image(poster)
+        if strip is not None:
+            strip_col.image(strip)
+    elif thumbnails.is_stored_pending(key, version):
+        thumbnail_status(key, version)
+
+
+@st.fragment(run_every=1)
+def thumbnail_status(key, version):
+    """Polls the images of a stored answer and refreshes the page once they are made."""
+    if thumbnails.is_stored_pending(key, version):
+        st.caption("🖼️ Preview being prepared...")
+    else:
+        st.rerun()
+
+
+@st.fragment
+def candidate_review(session, candidate, answers, questions):
+    """All answers of one candidate. Videos load only when opened."""
+    store = get_answer_store()
+
+    # Transcripts and scores are read for this candidate only
+    transcripts = transcribe.connect() if os.path.exists(transcribe.TRANSCRIPTS_DB) else None
+    scores = scoring.connect() if os.path.exists(scoring.SCORES_DB) else None
+    if transcripts is None:
+        st.caption("No transcripts yet. Run `python transcribe.py` to add them.")
+
+    for q_index, key, version in answers:
+        question = questions[q_index] if q_index < len(questions) else ""
+        st.subheader(f"Question {q_index + 1}")
+        st.write(question)
+
+        score = scoring.get_score(key, scores) if scores is not None else None
+        if score is not None:
+            value, details = score
+            st.metric("Score", f"{value:.0f}/100")
+            if details["missing"]:
+                st.caption("Not mentioned: " + ", ".join(details["missing"]))
+        if transcripts is not None:
+            text = transcribe.get_transcript(key, transcripts)
+            st.text_area("Transcript", text or "(not transcribed yet)", key=f"transcript_{key}", disabled=True)
+
+        # Clicking Play reruns only this fragment, which then draws the one player
+        if st.session_state.get("playing") == key:
+            play_answer(store, key)
+        else:
+            show_thumbnails(store, key, version)
+            st.button("▶️ Play answer", key=f"play_{key}", on_click=start_playing, args=(key,))
+        st.divider()
+
+
+# --- MAIN APP ---
+st.set_page_config(page_title="Interview Evaluator", page_icon="📋", layout="wide")
+require_evaluator_login()
+
+if get_answer_store() is None:
+    st.error("Set INTERVIEW_ANSWER_STORE to the answer store to review.")
+    st.stop()
+
+index = answer_index()
+session = st.sidebar.selectbox("Interview session", list_sessions(), format_func=session_title)
+if st.sidebar.button("🔄 Refresh list"):
+    answer_index.clear()
+    st.rerun()
+
+st.title(f"📋 {session_title(session)}")
+questions = load_questions(session)
+candidates = index.get(session, {})
+review = st.session_state.get("review")
+
+if review and review[0] == session and review[1] in candidates:
+    st.button("⬅️ Back to candidates", on_click=close_review)
+    st.header(review[1])
+    candidate_review(session, review[1], candidates[review[1]], questions)
+else:
+    candidate_list(session, candidates, len(questions))
@@ -0,0 +1,43 @@
+import os
+import zipfile
+
+from upload_spool import session_spool_dir
+
+# --- CONFIGURATION ---
+ARCHIVE_NAME = "interview_answers.zip"
+
+
+def archive_path(spool_id):
+    """Returns where the ZIP of a session's answers is written."""
+    return os.path.join(session_spool_dir(spool_id), ARCHIVE_NAME)
+
+
+def archive_is_current(path, files):
+    """True if the archive exists and is newer than every answer in it."""
+    if not os.path.exists(path):
+        return False
+    built = os.path.getmtime(path)
+    return all(os.path.getmtime(source) <= built for source, _ in files)
+
+
+def build_archive(spool_id, files):
+    """Writes a ZIP of (source path, name in archive) pairs and returns its path.
+
+    Files are copied into the archive from disk in small blocks, so the
+    archive is never held in memory. Videos are already compressed, so
+    they are stored rather than deflated again.
+    """
+    path = archive_path(spool_id)
+    if archive_is_current(path, files):
+        return path
+
+    partial = path + ".part"
+    try:
+        with zipfile.ZipFile(partial, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+            for source, name in files:
+                archive.write(source, arcname=name)
+        os.replace(partial, path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    return path
@@ -0,0 +1,345 @@
+"""Server-side storage for submitted answers.
+
+Set INTERVIEW_ANSWER_STORE to turn it on:
+
+    INTERVIEW_ANSWER_STORE=/srv/interview-answers         # local directory
+    INTERVIEW_ANSWER_STORE=s3://bucket/optional/prefix     # S3 or compatible
+
+For an S3-compatible stand-in (MinIO, LocalStack, ...) also set
+INTERVIEW_S3_ENDPOINT_URL. Answers are keyed as
+<candidate>/<session>/qNN.<ext> and written in chunks that resume where
+an interrupted write stopped. The app submits writes to a small worker
+pool (submit_put), so a slow store never holds a script thread.
+"""
+import os
+import re
+import shutil
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+
+# --- CONFIGURATION ---
+ANSWER_STORE_URL = os.environ.get("INTERVIEW_ANSWER_STORE", "")
+S3_ENDPOINT_URL = os.environ.get("INTERVIEW_S3_ENDPOINT_URL") or None
+
+# S3 multipart parts must be at least 5 MiB (except the last one)
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# How long a presigned playback URL stays valid (seconds)
+PLAYBACK_URL_SECONDS = 60 * 60
+
+# Answers written to the store at the same time, per process
+STORE_WORKERS = int(os.environ.get("INTERVIEW_STORE_WORKERS", "4"))
+
+_executor = None
+_jobs = {}
+_owners = {}
+_lock = threading.Lock()
+
+
+class AnswerStoreError(Exception):
+    """Raised when an answer could not be written to (or deleted from) the store."""
+
+
+def answer_key(candidate, session, q_index, extension):
+    """Builds the storage key for one answer."""
+    return f"{candidate}/{session}/q{q_index + 1:02d}{extension}"
+
+
+_KEY_PATTERN = re.compile(r"(?P<candidate>[^/]+)/(?P<session>[^/]+)/q(?P<number>\d+)\.\w+")
+
+
+def parse_answer_key(key):
+    """Splits a key into (candidate, session, q_index), or returns None."""
+    match = _KEY_PATTERN.fullmatch(key)
+    if match is None:
+        return None
+    return match["candidate"], match["session"], int(match["number"]) - 1
+
+
+def candidate_slug(name):
+    """Turns a candidate's name into a safe key component."""
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "candidate"
+
+
+class LocalAnswerStore:
+    """Stores answers under a local directory."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def path_for(self, key):
+        return os.path.join(self.root, *key.split("/"))
+
+    def exists(self, key):
+        return os.path.isfile(self.path_for(key))
+
+    def delete(self, key):
+        try:
+            os.remove(self.path_for(key))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            raise AnswerStoreError(f"Could not delete {key}: {e}") from e
+
+    def list_answers(self):
+        """Yields (key, version) for every stored answer."""
+        if not os.path.isdir(self.root):
+            return
+        for folder, _, files in os.walk(self.root):
+            for name in files:
+                path = os.path.join(folder, name)
+                key = os.path.relpath(path, self.root).replace(os.sep, "/")
+                if parse_answer_key(key) is not None:
+                    stat = os.stat(path)
+                    yield key, f"{stat.st_size}-{stat.st_mtime_ns}"
+
+    @contextmanager
+    def local_copy(self, key):
+        """Gives a local file path for an answer (the stored file itself)."""
+        yield self.path_for(key)
+
+    def playback_url(self, key):
+        """Local answers have no URL of their own; the app serves the file."""
+        return None
+
+    def put_file(self, key, source_path):
+        """Copies a file into the store, resuming an interrupted copy."""
+        target = self.path_for(key)
+        partial = target + ".part"
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            # Bytes already written by an earlier, interrupted attempt. A partial
+            # copy older than the source belongs to a since-replaced answer.
+            offset = 0
+            if os.path.exists(partial) and os.path.getmtime(partial) >= os.path.getmtime(source_path):
+                offset = os.path.getsize(partial)
+            if offset > os.path.getsize(source_path):
+                offset = 0
+            with open(source_path, "rb") as source, open(partial, "ab" if offset else "wb") as out:
+                source.seek(offset)
+                while True:
+                    chunk = source.read(UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    out.write(chunk)
+                    out.flush()
+                os.fsync(out.fileno())
+            os.replace(partial, target)
+        except OSError as e:
+            raise AnswerStoreError(f"Could not store {key}: {e}") from e
+        return key
+
+
+class S3AnswerStore:
+    """Stores answers in an S3 bucket (or an S3-compatible server)."""
+
+    def __init__(self, bucket, prefix="", endpoint_url=None):
+        import boto3
+
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.client = boto3.client("s3", endpoint_url=endpoint_url)
+
+    def object_name(self, key):
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def exists(self, key):
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.object_name(key))
+            return True
+        except ClientError:
+            return False
+
+    def delete(self, key):
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        try:
+            self.client.delete_object(Bucket=self.bucket, Key=self.object_name(key))
+        except (BotoCoreError, ClientError) as e:
+            raise AnswerStoreError(f"Could not delete {key}: {e}") from e
+
+    def list_answers(self):
+        """Yields (key, version) for every stored answer."""
+        paginator = self.client.get_paginator("list_objects_v2")
+        prefix = f"{self.prefix}/" if self.prefix else ""
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            for item in page.get("Contents", []):
+                key = item["Key"][len(prefix):]
+                if parse_answer_key(key) is not None:
+                    yield key, item["ETag"].strip('"')
+
+    @contextmanager
+    def local_copy(self, key):
+        """Downloads an answer to a temporary file for the duration of the block."""
+        folder = tempfile.mkdtemp(prefix="answer-")
+        path = os.path.join(folder, key.rsplit("/", 1)[-1])
+        try:
+            self.client.download_file(self.bucket, self.object_name(key), path)
+            yield path
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+
+    def playback_url(self, key, expires=PLAYBACK_URL_SECONDS):
+        """Returns a presigned URL, so the browser streams the answer from S3 directly."""
+        return self.client.generate_presigned_url(
+            "get_object", Params={"Bucket": self.bucket, "Key": self.object_name(key)}, ExpiresIn=expires,
+        )
+
+    def _pending_upload(self, name, source_path):
+        """Returns (upload_id, parts) of an unfinished multipart upload, if any.
+
+        Uploads started before the source file was written belong to an
+        answer that has since been replaced, so they are aborted.
+        """
+        source_mtime = os.path.getmtime(source_path)
+        uploads = self.client.list_multipart_uploads(Bucket=self.bucket, Prefix=name)
+        for upload in uploads.get("Uploads", []):
+            if upload["Key"] != name:
+                continue
+            if upload["Initiated"].timestamp() < source_mtime:
+                self.client.abort_multipart_upload(Bucket=self.bucket, Key=name, UploadId=upload["UploadId"])
+            else:
+                parts = []
+                paginator = self.client.get_paginator("list_parts")
+                for page in paginator.paginate(Bucket=self.bucket, Key=name, UploadId=upload["UploadId"]):
+                    parts.extend(page.get("Parts", []))
+                return upload["UploadId"], parts
+        return None, []
+
+    def put_file(self, key, source_path):
+        """Uploads a file in parts, continuing an interrupted multipart upload."""
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        name = self.object_name(key)
+        try:
+            upload_id, parts = self._pending_upload(name, source_path)
+            if upload_id is None:
+                upload_id = self.client.create_multipart_upload(Bucket=self.bucket, Key=name)["UploadId"]
+            done = {part["PartNumber"]: part["ETag"] for part in parts}
+
+            with open(source_path, "rb") as source:
+                part_number = 1
+                while True:
+                    if part_number in done:
+                        source.seek(UPLOAD_CHUNK_SIZE, os.SEEK_CUR)
+                        part_number += 1
+                        continue
+                    chunk = source.read(UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    response = self.client.upload_part(
+                        Bucket=self.bucket, Key=name, UploadId=upload_id,
+                        PartNumber=part_number, Body=chunk,
+                    )
+                    done[part_number] = response["ETag"]
+                    part_number += 1
+
+            # Drop parts past the end of the file, e.g. from a longer earlier upload
+            last_part = max((os.path.getsize(source_path) - 1) // UPLOAD_CHUNK_SIZE + 1, 1)
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket, Key=name, UploadId=upload_id,
+                MultipartUpload={"Parts": [
+                    {"PartNumber": n, "ETag": etag} for n, etag in sorted(done.items()) if n <= last_part
+                ]},
+            )
+        except (BotoCoreError, ClientError) as e:
+            raise AnswerStoreError(f"Could not store {key}: {e}") from e
+        return key
+
+
+@lru_cache(maxsize=None)
+def get_answer_store():
+    """Returns the configured answer store, or None when it is turned off."""
+    if not ANSWER_STORE_URL:
+        return None
+    if ANSWER_STORE_URL.startswith("s3://"):
+        bucket, _, prefix = ANSWER_STORE_URL[len("s3://"):].partition("/")
+        return S3AnswerStore(bucket, prefix, endpoint_url=S3_ENDPOINT_URL)
+    if ANSWER_STORE_URL.startswith("file://"):
+        return LocalAnswerStore(ANSWER_STORE_URL[len("file://"):])
+    return LocalAnswerStore(ANSWER_STORE_URL)
+
+
+# --- BACKGROUND WRITES ---
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=STORE_WORKERS, thread_name_prefix="answer-store")
+    return _executor
+
+
+def submit_put(store, key, source_path, on_done=None, owner=None):
+    """Queues store.put_file(key, source_path) and returns the job id.
+
+    on_done(key) is called from the worker thread once the answer is
+    stored. owner tags the job (e.g. with the session's spool id) so
+    forget_owner() can drop all of a session's writes at once.
+    """
+    job_id = uuid.uuid4().hex
+
+    def run():
+        store.put_file(key, source_path)
+        if on_done is not None:
+            on_done(key)
+        return key
+
+    future = _get_executor().submit(run)
+    with _lock:
+        _jobs[job_id] = future
+        _owners[job_id] = owner
+    return job_id
+
+
+def put_status(job_id):
+    """Returns 'queued', 'running', 'done', 'failed' or None for unknown writes."""
+    with _lock:
+        future = _jobs.get(job_id)
+    if future is None:
+        return None
+    if future.running():
+        return "running"
+    if not future.done():
+        return "queued"
+    return "failed" if future.exception() is not None else "done"
+
+
+def put_error(job_id):
+    """Returns why a write failed, or None."""
+    if put_status(job_id) != "failed":
+        return None
+    with _lock:
+        future = _jobs[job_id]
+    return str(future.exception())
+
+
+def wait_for_put(job_id):
+    """Blocks until a write has finished and returns its key.
+
+    Returns None if the write failed or is unknown to this process.
+    """
+    with _lock:
+        future = _jobs.get(job_id)
+    if future is None:
+        return None
+    try:
+        return future.result()
+    except Exception:
+        return None
+
+
+def forget_owner(owner):
+    """Drops every write submitted for one owner, cancelling those not yet started."""
+    with _lock:
+        job_ids = [job_id for job_id, job_owner in _owners.items() if job_owner == owner]
+        futures = [_jobs.pop(job_id) for job_id in job_ids]
+        for job_id in job_ids:
+            del _owners[job_id]
+    for future in futures:
+        future.cancel()
@@ -0,0 +1,8 @@
+# One app for every interview session. Pick the question bank from the
+# sidebar or link straight to it, e.g. http://host:8501/?session=session3
+# (?session=mixed asks a random few questions from every bank)
+# Run with: streamlit run app.py
+from interview_engine import run_interview
+from question_bank import MIXED_SESSION, list_sessions
+
+run_interview("session1", session_choices=list_sessions() + (MIXED_SESSION,))
@@ -0,0 +1,138 @@
+"""Password check and login throttling.
+
+The shared password is read from Streamlit Secrets once per process and
+compared in constant time. Login attempts draw from two token buckets,
+one per browser session and one per client IP, and a client whose bucket
+is empty is turned away before the login form is even drawn.
+"""
+import hmac
+import os
+import threading
+import time
+import uuid
+from functools import lru_cache
+
+import streamlit as st
+
+# --- CONFIGURATION ---
+# Per browser session: a burst of 5 attempts, then one every 30 seconds
+SESSION_BURST = int(os.environ.get("INTERVIEW_LOGIN_SESSION_BURST", 5))
+SESSION_REFILL_SECONDS = float(os.environ.get("INTERVIEW_LOGIN_SESSION_REFILL", 30))
+
+# Per IP: generous, since a whole classroom may share one address
+IP_BURST = int(os.environ.get("INTERVIEW_LOGIN_IP_BURST", 30))
+IP_REFILL_SECONDS = float(os.environ.get("INTERVIEW_LOGIN_IP_REFILL", 2))
+
+# Behind our own reverse proxy (see deploy/), which sets X-Forwarded-For
+BEHIND_PROXY = os.environ.get("INTERVIEW_BEHIND_PROXY", "0") == "1"
+
+
+@lru_cache(maxsize=None)
+def get_admin_password():
+    """Fetches the password from Streamlit Secrets once per process."""
+    try:
+        return st.secrets["admin"]
+    except KeyError:
+        # Fallback for local testing if secrets.toml isn't set up yet
+        # You can remove this fallback before deploying if you want strict security
+        return "Delta"
+    except FileNotFoundError:
+        return "Delta"
+
+
+@lru_cache(maxsize=None)
+def get_evaluator_password():
+    """Fetches the evaluator password from Streamlit Secrets, or None if unset.
+
+    Candidates know the admin password, so the evaluator page has its own
+    and no fallback.
+    """
+    try:
+        return st.secrets["evaluator"]
+    except (KeyError, FileNotFoundError):
+        return None
+
+
+def password_matches(password_input, expected=None):
+    """Compares a password with the admin (or the given) password in constant time."""
+    expected = get_admin_password() if expected is None else expected
+    return hmac.compare_digest(password_input.encode("utf-8"), expected.encode("utf-8"))
+
+
+class TokenBucket:
+    """A thread-safe token bucket per key (e.g. per IP address)."""
+
+    def __init__(self, burst, refill_seconds, max_keys=10000):
+        self.burst = burst
+        self.refill_seconds = refill_seconds
+        self.max_keys = max_keys
+        self.buckets = {}  # key -> (tokens, last update time)
+        self.lock = threading.Lock()
+
+    def _tokens(self, key, now):
+        tokens, updated = self.buckets.get(key, (self.burst, now))
+        return min(self.burst, tokens + (now - updated) / self.refill_seconds)
+
+    def available(self, key):
+        """True if the key may make an attempt right now."""
+        with self.lock:
+            return self._tokens(key, time.monotonic()) >= 1
+
+    def take(self, key):
+        """Uses up one token. Returns False if the bucket was empty."""
+        now = time.monotonic()
+        with self.lock:
+            tokens = self._tokens(key, now)
+            if tokens < 1:
+                return False
+            self.buckets[key] = (tokens - 1, now)
+            if len(self.buckets) > self.max_keys:
+                self._forget_full(now)
+            return True
+
+    def _forget_full(self, now):
+        # Buckets that have refilled completely carry no information
+        for key in [k for k in self.buckets if self._tokens(k, now) >= self.burst]:
+            del self.buckets[key]
+
+
+session_limiter = TokenBucket(SESSION_BURST, SESSION_REFILL_SECONDS)
+ip_limiter = TokenBucket(IP_BURST, IP_REFILL_SECONDS)
+
+
+def client_address(forwarded, peer, behind_proxy=None):
+    """Picks the client's address from X-Forwarded-For and the connection's peer.
+
+    Clients can send any X-Forwarded-For, so it is only read behind our
+    own proxy (BEHIND_PROXY), and then only its last entry: the one the
+    proxy added.
+    """
+    if behind_proxy is None:
+        behind_proxy = BEHIND_PROXY
+    if behind_proxy and forwarded:
+        return forwarded.split(",")[-1].strip()
+    return peer or "unknown"
+
+
+def client_ip():
+    """Returns the address of this session's client."""
+    return client_address(st.context.headers.get("X-Forwarded-For"), getattr(st.context, "ip_address", None))
+
+
+def login_session_id():
+    """Returns a random id for this browser session."""
+    if "login_session_id" not in st.session_state:
+        st.session_state.login_session_id = uuid.uuid4().hex
+    return st.session_state.login_session_id
+
+
+def login_blocked():
+    """True if this client has used up its login attempts for now."""
+    return not (session_limiter.available(login_session_id()) and ip_limiter.available(client_ip()))
+
+
+def try_login(password_input, expected=None):
+    """Counts a login attempt and checks the password if the client may try."""
+    if not session_limiter.take(login_session_id()) or not ip_limiter.take(client_ip()):
+        return False
+    return password_matches(password_input, expected)
@@ -0,0 +1,260 @@
+"""Load test for the interview flow.
+
+Drives a SessionN.py script headlessly with streamlit.testing.v1.AppTest
+for a number of simulated candidates running at the same time, each in
+its own process (AppTest instances share Streamlit's global runtime, so
+several in one process break each other), and reports per-step latency
+percentiles, peak RSS and peak thread count.
+
+The numbers are per isolated process: every candidate has a Streamlit
+runtime, caches and thread pools to itself, and no websocket or browser
+is involved. They show what one session costs and how the candidates
+compete for CPU and disk, not how a single `streamlit run` server
+behaves with that many sessions; use deploy/ and a browser-level tool
+for that.
+
+    python benchmark.py --users 20 --questions 5 --video-mb 50 > bench_output.txt
+
+The synthetic video is uploaded the way the uploader component sends
+it: one chunk message per rerun, set as the component's value, each
+acknowledged before the next is sent. AppTest cannot click a download,
+so that step sets what the download callback would.
+"""
+import argparse
+import base64
+import multiprocessing
+import os
+import queue
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+from streamlit.testing.v1 import AppTest
+
+from recorder import UPLOAD_CHUNK_BYTES
+
+STEPS = ("login", "upload", "preview", "download", "countdown", "next")
+
+
+class StepTimer:
+    """Collects step durations from every simulated candidate."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.lock = threading.Lock()
+
+    def time(self, step, action):
+        start = time.perf_counter()
+        result = action()
+        with self.lock:
+            self.samples[step].append(time.perf_counter() - start)
+        return result
+
+
+class ThreadSampler(threading.Thread):
+    """Records the highest number of live threads while the test runs."""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.peak = threading.active_count()
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(0.05):
+            self.peak = max(self.peak, threading.active_count())
+
+
+def find_button(at, label_start):
+    for button in at.button:
+        if button.label.startswith(label_start):
+            return button
+    raise AssertionError(f"no button starting with {label_start!r}")
+
+
+def checked(at):
+    """Fails the candidate if the script run raised, in the script or a fragment."""
+    if at.exception:
+        raise AssertionError(at.exception[0].value)
+    return at
+
+
+def upload_video(at, q_index, video_path):
+    """Sends a video through the question's uploader, one chunk per rerun.
+
+    The question number is sent as one more chunk, so every answer has
+    its own content; the spool would not keep a repeated answer.
+    """
+    progress = at.session_state["progress"]
+    key = f"uploader_q{q_index}_{progress.uploader_round}"
+    recording_id = uuid.uuid4().hex
+    with open(video_path, "rb") as video:
+        chunks = list(iter(lambda: video.read(UPLOAD_CHUNK_BYTES), b""))
+    chunks.append(f"q{q_index}".encode("utf-8"))
+    messages = [
+        {"rec": recording_id, "seq": seq, "data": base64.b64encode(data).decode("ascii"), "final": False}
+        for seq, data in enumerate(chunks)
+    ]
+    messages.append({"rec": recording_id, "seq": len(chunks), "final": True, "mime": "video/mp4", "ext": ".mp4"})
+    for message in messages:
+        at.session_state[key] = message
+        checked(at.run())
+        state = (progress.answer(q_index).recording or {}).get(key)
+        if message["final"]:
+            break
+        if state is None or state["next_seq"] != message["seq"] + 1:
+            raise AssertionError(f"chunk {message['seq']} of question {q_index + 1} was not acknowledged")
+    if progress.answer_path(q_index) is None:
+        raise AssertionError(f"the upload for question {q_index + 1} was not kept")
+
+
+def run_candidate(script, questions, video_path, countdown, media_port, start_barrier, results):
+    """Walks one candidate through login and the first few questions.
+
+    Runs in a process of its own and puts a report on the results queue:
+    step samples, errors, start and end time, peak RSS (KiB) and peak
+    thread count.
+    """
+    # With the media server turned on, each candidate process runs its own
+    os.environ["INTERVIEW_MEDIA_PORT"] = str(media_port)
+    timer = StepTimer()
+    errors = []
+    started = None
+    sampler = ThreadSampler()
+    # An exception in any other thread of the candidate is a failure too
+    threading.excepthook = lambda hook_args: errors.append(repr(hook_args.exc_value))
+    try:
+        # Every candidate starts at the same time, after its process has loaded
+        start_barrier.wait(timeout=300)
+        started = time.time()
+        at = AppTest.from_file(script, default_timeout=120)
+        at.secrets["admin"] = "Delta"
+        sampler.start()
+        checked(at.run())
+
+        def login():
+            at.text_input[0].input("Delta")
+            if len(at.text_input) > 1:
+                at.text_input[1].input("Benchmark Candidate")
+            return checked(find_button(at, "Login").click().run())
+
+        timer.time("login", login)
+
+        for q_index in range(questions):
+            timer.time("upload", lambda: upload_video(at, q_index, video_path))
+            timer.time("preview", lambda: checked(at.run()))
+            answer = at.session_state["progress"].answer(q_index)
+
+            # What mark_download_clicked does when the download is clicked
+            answer.saved = True
+            answer.deadline = time.time() + countdown
+            timer.time("download", lambda: checked(at.run()))
+
+            def wait_for_next_button():
+                while not any(b.label.startswith("Submit & Next") for b in at.button):
+                    time.sleep(0.1)
+                    checked(at.run())
+
+            timer.time("countdown", wait_for_next_button)
+            timer.time("next", lambda: checked(find_button(at, "Submit & Next").click().run()))
+    except Exception as e:  # Reported with the results, not fatal to the run
+        errors.append(repr(e))
+    sampler.stopped.set()
+    results.put({
+        "samples": dict(timer.samples),
+        "errors": errors,
+        "started": started,
+        "finished": time.time(),
+        # ru_maxrss is in KiB on Linux
+        "rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "threads": sampler.peak,
+    })
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--script", default="Session1.py", help="interview script to drive")
+    parser.add_argument("--users", type=int, default=10, help="simulated candidates at once")
+    parser.add_argument("--questions", type=int, default=3, help="questions answered per candidate")
+    parser.add_argument("--video-mb", type=float, default=20, help="size of the synthetic answer video")
+    parser.add_argument("--countdown", type=float, default=0, help="seconds of save countdown to simulate")
+    parser.add_argument("--media-port", type=int, default=18765, help="media server port of the first candidate")
+    args = parser.parse_args(argv)
+
+    with tempfile.NamedTemporaryFile(suffix=".mp4", delete=False) as video:
+        block = os.urandom(1024 * 1024)
+        remaining = int(args.video_mb * 1024 * 1024)
+        while remaining > 0:
+            video.write(block[:remaining])
+            remaining -= len(block)
+    context = multiprocessing.get_context("spawn")
+    start_barrier = context.Barrier(args.users)
+    results = context.Queue()
+    candidates = [
+        context.Process(
+            target=run_candidate,
+            args=(args.script, args.questions, video.name, args.countdown, args.media_port + i, start_barrier, results),
+        )
+        for i in range(args.users)
+    ]
+    for candidate in candidates:
+        candidate.start()
+
+    reports = []
+    while len(reports) < len(candidates):
+        try:
+            reports.append(results.get(timeout=1))
+        except queue.Empty:
+            if not any(candidate.is_alive() for candidate in candidates):
+                break
+    for candidate in candidates:
+        candidate.join()
+    os.remove(video.name)
+
+    timer = StepTimer()
+    errors = []
+    for report in reports:
+        for step, values in report["samples"].items():
+            timer.samples[step].extend(values)
+        if report["errors"]:
+            errors.append("; ".join(report["errors"]))
+    errors += ["candidate process exited without a report"] * (len(candidates) - len(reports))
+
+    print(f"script={args.script} users={args.users} questions={args.questions} "
+          f"video={args.video_mb}MB countdown={args.countdown}s")
+    print("mode: one isolated AppTest process per candidate (no shared server, no websocket); "
+          "latency and memory are per process")
+    print(f"{'step':<10} {'count':>6} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for step in STEPS:
+        values = timer.samples.get(step)
+        if not values:
+            continue
+        print(f"{step:<10} {len(values):>6} "
+              f"{statistics.median(values) * 1000:>9.1f} "
+              f"{percentile(values, 0.90) * 1000:>9.1f} "
+              f"{percentile(values, 0.99) * 1000:>9.1f} "
+              f"{max(values) * 1000:>9.1f}")
+    starts = [report["started"] for report in reports if report["started"] is not None]
+    if starts:
+        print(f"wall time: {max(report['finished'] for report in reports) - min(starts):.1f} s")
+    if reports:
+        print(f"peak RSS per candidate process: {max(r['rss'] for r in reports) / 1024:.1f} MiB "
+              f"(all processes: {sum(r['rss'] for r in reports) / 1024:.1f} MiB)")
+        print(f"peak threads per candidate process: {max(r['threads'] for r in reports)}")
+    print(f"failed candidates: {len(errors)}")
+    for error in errors:
+        print(f"  {error}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""Runs the interview app as several Streamlit processes on one machine.
+
+One Streamlit process uses one core. This starts N of them on
+consecutive local ports, all sharing the same spool directory, progress
+database and media secret, so a reverse proxy (see nginx.conf) can spread
+candidates over every core. Workers that exit are restarted.
+
+    python deploy/launch.py --workers 4 --script app.py
+    python deploy/launch.py --workers 4 --check     # health-check running workers
+
+A single standalone media server is started as well, instead of one per
+worker. The proxy forwards /media/ to it, unless INTERVIEW_MEDIA_BASE_URL
+points the browsers elsewhere.
+"""
+import argparse
+import os
+import secrets
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from progress_store import PROGRESS_DB  # noqa: E402
+from upload_spool import SPOOL_DIR  # noqa: E402
+
+# --- CONFIGURATION ---
+BASE_PORT = 8601
+HEALTH_PATH = "/_stcore/health"
+# Wait this long before restarting a worker that exited (seconds)
+RESTART_DELAY = 2
+
+
+def worker_env(workers):
+    """Builds the environment shared by every process."""
+    env = dict(os.environ)
+    env["INTERVIEW_SPOOL_DIR"] = SPOOL_DIR
+    env["INTERVIEW_PROGRESS_DB"] = PROGRESS_DB
+    # Every worker must sign media URLs the same way
+    env.setdefault("INTERVIEW_MEDIA_SECRET", secrets.token_hex(32))
+    # Split the compression threads between the workers instead of giving each the lot
+    env.setdefault("INTERVIEW_TRANSCODE_WORKERS", str(max(1, (os.cpu_count() or 2) // 2 // workers)))
+    return env
+
+
+def streamlit_command(script, port):
+    return [
+        sys.executable, "-m", "streamlit", "run", script,
+        "--server.address", "127.0.0.1",
+        "--server.port", str(port),
+        "--server.headless", "true",
+        "--server.fileWatcherType", "none",
+        "--browser.gatherUsageStats", "false",
+    ]
+
+
+def is_healthy(port, timeout=3):
+    """True if the worker on this port answers Streamlit's health check."""
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}{HEALTH_PATH}", timeout=timeout) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+
+def check(ports):
+    """Prints the health of every worker. Returns the exit code."""
+    failed = 0
+    for port in ports:
+        healthy = is_healthy(port)
+        failed += not healthy
+        print(f"worker :{port} {'ok' if healthy else 'DOWN'}")
+    print(f"spool {SPOOL_DIR}, progress {PROGRESS_DB}")
+    return 1 if failed else 0
+
+
+def run(script, ports):
+    """Starts the workers and keeps them running until interrupted."""
+    env = worker_env(len(ports))
+    os.makedirs(SPOOL_DIR, exist_ok=True)
+    commands = {port: streamlit_command(script, port) for port in ports}
+    # One media server for all workers; they could not all bind its port
+    env["INTERVIEW_MEDIA_EMBEDDED"] = "0"
+    env.setdefault("INTERVIEW_MEDIA_HOST", "127.0.0.1")
+    # Trust the proxy's X-Forwarded-For, and build media URLs from the page's address
+    env["INTERVIEW_BEHIND_PROXY"] = "1"
+    commands["media"] = [sys.executable, os.path.join(REPO_DIR, "media_server.py")]
+
+    envs = {name: env for name in commands}
+    if env.get("INTERVIEW_METRICS_PORT"):
+        # Each process serves its own metrics, on consecutive ports
+        metrics_port = int(env["INTERVIEW_METRICS_PORT"])
+        for offset, name in enumerate(commands):
+            envs[name] = dict(env, INTERVIEW_METRICS_PORT=str(metrics_port + offset))
+
+    processes = {name: subprocess.Popen(command, cwd=REPO_DIR, env=envs[name]) for name, command in commands.items()}
+    print(f"Started {len(ports)} workers on ports {ports[0]}-{ports[-1]} (spool {SPOOL_DIR})")
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        while True:
+            time.sleep(RESTART_DELAY)
+            for name, process in processes.items():
+                if process.poll() is not None:
+                    print(f"{name} exited with {process.returncode}, restarting", file=sys.stderr)
+                    processes[name] = subprocess.Popen(commands[name], cwd=REPO_DIR, env=envs[name])
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in processes.values():
+            process.terminate()
+        for process in processes.values():
+            process.wait()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run several interview app workers behind a reverse proxy.")
+    parser.add_argument("--script", default="app.py", help="app script to run, e.g. Session4.py")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="number of Streamlit processes")
+    parser.add_argument("--base-port", type=int, default=BASE_PORT, help="port of the first worker")
+    parser.add_argument("--check", action="store_true", help="health-check running workers and exit")
+    args = parser.parse_args(argv)
+
+    ports = list(range(args.base_port, args.base_port + args.workers))
+    if args.check:
+        return check(ports)
+    return run(args.script, ports)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,674 @@
+import importlib
+import math
+import mimetypes
+import os
+import threading
+import time
+
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+
+import metrics
+import thumbnails
+import transcode
+
+from answer_store import AnswerStoreError, answer_key, candidate_slug, get_answer_store
+from answer_store import put_error, put_status, submit_put, wait_for_put
+from auth import login_blocked, try_login
+from question_bank import interview_plan, load_bank, session_title
+from session_manager import get_progress, lost_answers, reset_progress, restore_from_url, save_progress
+
+# Only needed after login; imported inside the functions that use them so a
+# cold process draws the login page sooner (see startup_profile.py)
+DEFERRED_MODULES = ("streamlit.components.v1", "recorder", "media_server", "tts_cache", "answer_archive")
+_warm_up_started = threading.Event()
+
+# --- CONFIGURATION ---
+# Seconds to wait after the download click before the Next button appears
+COUNTDOWN_SECONDS = 5
+
+# Let candidates save every answer in one ZIP at the end instead of one by one.
+# Only takes effect with the media server, which streams the ZIP from disk.
+SAVE_AT_END = os.environ.get("INTERVIEW_SAVE_AT_END", "0") == "1"
+
+# File types accepted by the uploader in video and audio-only sessions
+VIDEO_UPLOAD_TYPES = ['mp4', 'mov', 'avi']
+AUDIO_UPLOAD_TYPES = ['m4a', 'mp3', 'wav', 'ogg', 'opus', 'webm', 'aac']
+# Audio that is already compressed well enough to keep as it is
+COMPACT_AUDIO_EXTENSIONS = (".m4a", ".mp3", ".ogg", ".opus", ".webm", ".aac")
+
+
+# --- HELPER FUNCTIONS ---
+def warm_up_deferred_modules():
+    """Imports the post-login modules in the background, once per process.
+
+    Called while the login page is shown, so the first candidate after a
+    cold start does not wait for them after entering the password.
+    """
+    if _warm_up_started.is_set():
+        return
+    _warm_up_started.set()
+
+    def import_all():
+        for name in DEFERRED_MODULES:
+            importlib.import_module(name)
+
+    threading.Thread(target=import_all, name="warm-up-imports", daemon=True).start()
+
+
+def native_speak_button(text):
+    """Creates a button to read the question using phone's voice."""
+    import streamlit.components.v1 as components
+
+    safe_text = text.replace("'", "").replace('"', "")
+    html_code = f"""
+    <div style="display: flex; justify-content: center; margin-bottom: 20px;">
+        <button onclick="
+            var msg = new SpeechSynthesisUtterance('{safe_text}');
+            msg.lang = 'en-US';
+            window.speechSynthesis.cancel();
+            window.speechSynthesis.speak(msg);
+        " style="padding: 10px 20px; font-size: 18px; border-radius: 8px; border: none; background-color: #ff4b4b; color: white; cursor: pointer;">
+            🔊 Tap to Hear Question
+        </button>
+    </div>
+    """
+    components.html(html_code, height=80)
+
+
+def speak_question(text):
+    """Plays the pre-rendered audio for a question.
+
+    Falls back to the phone's own voice when the audio cache has not been
+    built (see tts_cache.py).
+    """
+    from tts_cache import cached_audio_path
+
+    audio_path = cached_audio_path(text)
+    if audio_path is None:
+        native_speak_button(text)
+    else:
+        st.audio(audio_path, format="audio/mpeg")
+
+
+def preview_answer(path, audio_only=False):
+    """Shows the answer in a video (or, for audio-only sessions, audio) player.
+
+    The player gets a stable media server URL, so the file is streamed
+    from disk, reruns send only that URL and the browser keeps its cached
+    copy.
+    """
+    from media_server import media_enabled, media_url
+
+    player = st.audio if audio_only else st.video
+    with metrics.timed("preview"):
+        if media_enabled():
+            player(media_url(path))
+        else:
+            # The media server could not start; Streamlit reads the file into memory
+            player(path)
+
+
+def answer_download_button(label, path, download_name, mime, on_click=None, args=()):
+    """A download button for a spooled file, streamed from disk by the media server."""
+    from media_server import media_enabled, media_url
+
+    if media_enabled():
+        st.link_button(label, media_url(path, download_name=download_name), on_click=on_click or "ignore", args=args)
+        return
+    # The media server could not start; Streamlit reads the file into memory
+    with open(path, "rb") as answer_data:
+        st.download_button(
+            label=label, data=answer_data, file_name=download_name, mime=mime,
+            on_click=on_click or "rerun", args=args,
+        )
+
+
+@st.fragment(run_every=1)
+def thumbnail_status(path):
+    """Polls the images of an answer and refreshes the page once they are made."""
+    if thumbnails.is_pending(path):
+        st.caption("🖼️ Preparing a preview of your answer...")
+    else:
+        st.rerun()
+
+
+def show_answer(progress, q_index, answer, path, audio_only=False):
+    """Shows a poster and preview strip of a video answer; the player only on request.
+
+    The images are made once from the original file, so the confirmation
+    screen does not load the whole video on every rerun.
+    """
+    if audio_only or not thumbnails.thumbnails_available():
+        preview_answer(path, audio_only)
+        return
+    images = thumbnails.for_file(answer.path)
+    if images is None and not thumbnails.is_pending(answer.path):
+        # The images could not be made, so show the player as before
+        preview_answer(path)
+        return
+    if images is None:
+        thumbnail_status(answer.path)
+    else:
+        poster, strip = images
+        st.image(poster, width=320)
+        if strip is not None:
+            st.image(strip, caption="Your answer from start to end")
+    if st.toggle("▶️ Watch the full video", key=f"watch_q{q_index}_{progress.uploader_round}"):
+        preview_answer(path)
+
+
+def mark_download_clicked(q_index):
+    """Callback to record that the user clicked download for the current question."""
+    from media_server import media_enabled
+
+    progress = get_progress()
+    answer = progress.answer(q_index)
+    answer.saved = True
+    if not media_enabled():
+        # Bytes sent by the media server are counted there
+        metrics.count("interview_served_bytes_total", os.path.getsize(best_answer_file(q_index, answer)[0]), via="download")
+    # Start the "Verifying save" countdown from the first click only
+    if answer.deadline is None:
+        answer.deadline = time.time() + COUNTDOWN_SECONDS
+        answer.saved_at = time.time()
+        metrics.since(answer.answered_at, "download", progress.session, q_index)
+
+
+def save_at_end():
+    """True when the answers are saved as one ZIP at the end instead of one by one."""
+    from media_server import media_enabled
+
+    return SAVE_AT_END and media_enabled()
+
+
+@st.fragment(run_every=1)
+def countdown_gate(answer):
+    """Shows the save countdown without holding the script thread.
+
+    Only this small fragment reruns once per second; the full page reruns
+    a single time, when the deadline has passed.
+    """
+    remaining = answer.deadline - time.time()
+    if remaining <= 0:
+        st.rerun()
+    st.info(f"⏳ Verifying save... Next button appears in {math.ceil(remaining)} seconds")
+
+
+def candidate_id(progress):
+    """Identifies the candidate in the answer store: name plus a short session tag."""
+    return f"{candidate_slug(st.session_state.candidate_name)}-{progress.spool_id[:8]}"
+
+
+def submit_to_store(progress, question, answer, old_answer=None, audio_only=False):
+    """Queues a spooled answer for the server-side store, if one is configured.
+
+    The key names the question's own bank and number, also in a mixed
+    interview. The write runs in the background; once it has finished,
+    the answer it replaces is deleted from the store.
+    """
+    store = get_answer_store()
+    if store is None:
+        return
+    key = answer_key(candidate_id(progress), question.session, question.index, os.path.splitext(answer.path)[1])
+
+    def on_done(stored_key):
+        discard_stored(old_answer, stored_key, audio_only)
+
+    answer.store_job = submit_put(store, key, answer.path, on_done, owner=progress.spool_id)
+
+
+def settle_store_write(answer):
+    """Records the outcome of the answer's background store write and returns its status."""
+    if not answer.store_job:
+        return None
+    status = put_status(answer.store_job)
+    if status == "done":
+        answer.stored_key = wait_for_put(answer.store_job)
+    elif status == "failed":
+        # The candidate can still save the video and send it in by hand
+        st.error(f"❌ {put_error(answer.store_job)}")
+    if status not in ("queued", "running"):
+        # Also a write another app process started before a resume
+        answer.store_job = None
+    return status
+
+
+@st.fragment(run_every=1)
+def store_status(job_id):
+    """Polls a background store write and refreshes the page once it has finished."""
+    if put_status(job_id) in ("queued", "running"):
+        st.caption("📤 Submitting your answer...")
+    else:
+        st.rerun()
+
+
+def compressed_key(stored_key, audio_only=False):
+    """Returns the key the compressed copy of a stored answer replaces it under."""
+    return os.path.splitext(stored_key)[0] + (".m4a" if audio_only else ".mp4")
+
+
+def discard_stored(old_answer, keep, audio_only=False):
+    """Deletes a replaced answer, and its compressed copy, from the answer store.
+
+    The new answer may have another extension, so it is stored under a
+    new key; the old objects would otherwise stay next to it.
+    """
+    store = get_answer_store()
+    if store is None or old_answer is None:
+        return
+    # The replaced answer may still be on its way into the store
+    old_key = old_answer.stored_key or (old_answer.store_job and wait_for_put(old_answer.store_job))
+    if not old_key:
+        return
+    for key in {old_key, compressed_key(old_key, audio_only)} - {keep}:
+        try:
+            store.delete(key)
+        except AnswerStoreError:
+            pass  # A stale copy is left behind, the new answer is stored
+
+
+def start_compression(progress, answer, audio_only=False):
+    """Queues the answer for background compression when ffmpeg is available.
+
+    If the answer was submitted to the server-side store, the compressed
+    copy replaces the original there once it is ready.
+    """
+    if not transcode.transcode_available():
+        return
+    if audio_only and answer.path.endswith(COMPACT_AUDIO_EXTENSIONS):
+        return  # Recorded or uploaded as compressed speech already
+    on_done = None
+    store = get_answer_store()
+    store_job = answer.store_job
+    if store is not None and store_job:
+
+        def on_done(output_path):
+            # The original has to be in the store before its copy replaces it
+            stored_key = wait_for_put(store_job)
+            if stored_key is None:
+                return
+            target_key = compressed_key(stored_key, audio_only)
+            try:
+                store.put_file(target_key, output_path)
+                if target_key != stored_key:
+                    store.delete(stored_key)
+            except AnswerStoreError:
+                return  # The original stays in the store
+
+    answer.transcode_job = transcode.submit(answer.path, on_done, owner=progress.spool_id, audio_only=audio_only)
+
+
+def best_answer_file(q_index, answer):
+    """Returns (path, download name, mime type) of the smallest ready copy."""
+    job_id = answer.transcode_job
+    path = (job_id and transcode.job_output(job_id)) or answer.path
+    extension = os.path.splitext(path)[1]
+    mime = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    return path, f"Student_Answer_Q{q_index + 1}{extension}", mime
+
+
+@st.fragment(run_every=2)
+def compression_status(job_id):
+    """Polls a compression job and refreshes the page once it has finished."""
+    if transcode.job_status(job_id) in ("queued", "running"):
+        st.caption("🗜️ Compressing your answer for a smaller download...")
+    else:
+        st.rerun()
+
+
+def accept_answer(progress, q_index, question, answer_path, audio_only=False):
+    """Makes a spooled file the answer to a question and starts its follow-up work."""
+    if progress.answer(q_index).answered_at is None:
+        metrics.since(progress.answer(q_index).shown_at, "answer", progress.session, q_index)
+    # A replaced answer has to be submitted or saved again
+    old_answer = progress.answers.get(q_index)
+    answer = progress.replace_answer(q_index, answer_path)
+    submit_to_store(progress, question, answer, old_answer, audio_only)
+    start_compression(progress, answer, audio_only)
+    if answer.store_job:
+        rerun_card()
+
+
+def take_answer(progress, q_index, question, path, audio_only=False):
+    """Accepts a finished recording or upload, unless it repeats a spooled answer.
+
+    The spool recognises repeated content by its hash and hands back the
+    earlier file, which then keeps its preview, saved state and stored copy.
+    """
+    progress.uploader_round += 1
+    if path == progress.answer_path(q_index):
+        st.info("ℹ️ This is the same file as your current answer, so your earlier upload is kept.")
+        return
+    for other_index, other in progress.answers.items():
+        if other_index != q_index and other.path == path:
+            st.warning(
+                f"⚠️ This is the same file as your answer to Question {other_index + 1}. "
+                "Please record or upload your answer to this question."
+            )
+            return
+    accept_answer(progress, q_index, question, path, audio_only)
+
+
+def rerun_card():
+    """Reruns only the question card, or the whole page outside a fragment rerun."""
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+
+def next_question_button(progress, question_count):
+    """Moves on to the next question."""
+    if st.button("Submit & Next Question ➡️"):
+        answer = progress.answer(progress.q_index)
+        metrics.since(answer.saved_at, "countdown", progress.session, progress.q_index)
+        metrics.since(answer.shown_at, "question", progress.session, progress.q_index)
+        metrics.count("interview_questions_completed_total", session=progress.session)
+        progress.q_index += 1
+        if progress.q_index < question_count:
+            rerun_card()
+        # The completion screen lies outside the card
+        st.rerun()
+
+
+def go_to_question(q_index):
+    get_progress().q_index = q_index
+
+
+# --- PAGE SECTIONS ---
+def warn_lost_answers(progress):
+    """Tells a returning candidate which earlier answers were not kept, and lets them redo one."""
+    lost = [q_index for q_index in lost_answers(progress) if q_index != progress.q_index]
+    if not lost:
+        return
+    numbers = ", ".join(str(q_index + 1) for q_index in lost)
+    st.warning(
+        f"⚠️ Your answers to Question {numbers} were cleared from the server during your long break, "
+        "so they are not in the download at the end. If you saved them to your device, keep those copies."
+    )
+    st.button(f"↩️ Answer Question {lost[0] + 1} again", on_click=go_to_question, args=(lost[0],))
+
+
+def session_picker(session, sessions):
+    """Lets one app serve every question bank via ?session=<name> or the sidebar."""
+    requested = st.query_params.get("session", session)
+    if requested not in sessions:
+        requested = session
+    session = st.sidebar.selectbox(
+        "Interview session",
+        sessions,
+        index=sessions.index(requested),
+        format_func=session_title,
+    )
+    st.query_params["session"] = session
+    return session
+
+
+def require_login():
+    """Shows the login form and stops the script until the password is right."""
+    if "authenticated" not in st.session_state:
+        st.session_state.authenticated = False
+
+    if st.session_state.authenticated:
+        return
+
+    # Throttled clients are turned away before anything else is drawn
+    if login_blocked():
+        st.error("⛔ Too many login attempts. Please wait a minute and try again.")
+        st.stop()
+
+    st.write("Welcome to")
+    st.title("Regent College Longon AI Based Interview System")
+    st.title("🔒 Restricted Access")
+    st.write("Please enter the password to begin the interview.")
+    warm_up_deferred_modules()
+
+    # 1. Input field
+    password_input = st.text_input("Enter Password:", type="password")
+    # Answers kept on the server are filed under the candidate's name
+    if get_answer_store() is not None:
+        name_input = st.text_input("Enter your full name:")
+    else:
+        name_input = "candidate"
+
+    # 2. Login Button
+    if st.button("Login 🔐"):
+        if not name_input.strip():
+            st.error("❌ Please enter your name.")
+        elif try_login(password_input):
+            st.session_state.candidate_name = name_input.strip()
+            st.session_state.authenticated = True
+            st.rerun()  # Reload the app to show the interview content
+        else:
+            st.error("❌ Incorrect Password. Please try again.")
+
+    st.stop()  # Stops the rest of the app from loading until logged in
+
+
+def show_question(progress, questions):
+    """Renders the card for the current question: speak, upload, save, next."""
+    from recorder import answer_recorder, answer_uploader, receiving
+
+    q_index = progress.q_index
+    answer = progress.answer(q_index)
+    if answer.shown_at is None:
+        answer.shown_at = time.time()
+    # 1. GET QUESTION
+    question = questions[q_index]
+    current_q = question.text
+
+    # Audio-only banks collect spoken answers without the camera
+    audio_only = load_bank(question.session).answer_mode == "audio"
+    media_word = "Audio" if audio_only else "Video"
+    st.subheader(f"Question {q_index + 1}")
+
+    # 2. SPEAK QUESTION
+    st.info(f"🗣️ **AI Asks:** {current_q}")
+    speak_question(current_q)
+
+    # 3. RECORD / UPLOAD VIDEO
+    if audio_only:
+        record_tab, upload_tab = st.tabs(["🎙️ Record here", "📁 Upload audio"])
+    else:
+        record_tab, upload_tab = st.tabs(["🎥 Record here", "📁 Upload a video"])
+    widget_round = progress.uploader_round
+
+    with record_tab:
+        st.write("👇 **Tap 'Start Recording', answer the question, then tap 'Stop'.**")
+        # Chunks are uploaded while the candidate is still speaking
+        recorded_path = answer_recorder(
+            f"recorder_q{q_index}_{widget_round}", progress.spool_id, q_index, answer, audio_only=audio_only
+        )
+        if recorded_path is not None:
+            take_answer(progress, q_index, question, recorded_path, audio_only)
+
+    with upload_tab:
+        if audio_only:
+            st.write("👇 **Choose a voice recording of your answer, then tap 'Upload'.**")
+        else:
+            st.write("👇 **Choose your video (or select 'Take Video' on a phone), then tap 'Upload'.**")
+        # Large videos are shrunk in the browser and sent in chunks the
+        # server acknowledges, so a weak connection only resends a chunk
+        uploaded_path = answer_uploader(
+            f"uploader_q{q_index}_{widget_round}",
+            progress.spool_id,
+            q_index,
+            answer,
+            AUDIO_UPLOAD_TYPES if audio_only else VIDEO_UPLOAD_TYPES,
+            audio_only=audio_only,
+        )
+        if uploaded_path is not None:
+            take_answer(progress, q_index, question, uploaded_path, audio_only)
+
+    # Every received chunk reruns the card, so the current answer's preview
+    # and download wait until the new one is complete
+    if receiving(answer):
+        st.caption(f"⏳ Receiving your new {media_word.lower()}...")
+        return
+
+    # The answer may be gone if the session sat idle past its TTL
+    if progress.answer_path(q_index) is None:
+        return
+    answer = progress.answer(q_index)
+
+    st.success(f"✅ {media_word} Recording Complete!")
+
+    # Show a preview of the video, read from the spooled file
+    # (the compressed copy once the background job has finished)
+    video_path, download_name, video_mime = best_answer_file(q_index, answer)
+    show_answer(progress, q_index, answer, video_path, audio_only)
+    if answer.transcode_job and transcode.job_status(answer.transcode_job) in ("queued", "running"):
+        compression_status(answer.transcode_job)
+    # Submitted answers skip the download and countdown, but only once
+    # the store has them
+    if settle_store_write(answer) in ("queued", "running"):
+        store_status(answer.store_job)
+        return
+
+    # Answers kept on the server, or saved as one ZIP at the end, need no
+    # download or countdown here
+    if answer.stored_key or save_at_end():
+        if answer.stored_key:
+            st.success("📤 Your answer has been submitted.")
+        else:
+            st.info("📦 You can save all your answers in one file at the end of the interview.")
+        answer_download_button("⬇️ Save a Copy (Optional)", video_path, download_name, video_mime)
+        next_question_button(progress, len(questions))
+        return
+
+    # --- LOGIC TO HANDLE DELAY ---
+    st.warning(f"⚠️ Step 1: Please click on the button below to save the {media_word.lower()} to your device.")
+
+    # 4. DOWNLOAD BUTTON
+    answer_download_button(
+        f"⬇️ Save {media_word} (Required)",
+        video_path,
+        download_name,
+        video_mime,
+        on_click=mark_download_clicked,
+        args=(q_index,),
+    )
+
+    # 5. COUNTDOWN & SUBMIT BUTTON LOGIC
+    # This block executes only AFTER the download button is clicked
+    if not answer.saved:
+        return
+
+    # If timer hasn't finished yet, show the countdown.
+    # The deadline is a timestamp, so no thread sleeps while we wait.
+    if time.time() < answer.deadline:
+        countdown_gate(answer)
+        return
+
+    # If timer is finished, show the Next button
+    st.success(f"{media_word} saved successfully!")
+    st.info(f"Submit all the {media_word.lower()}s to WhatsApp for evaluation after the interview session completes.")
+
+    next_question_button(progress, len(questions))
+
+
+@st.fragment
+def question_card(questions):
+    """The interactive part of the page.
+
+    Clicks, uploads and recordings inside the card rerun only this
+    fragment; the titles and instructions above it are drawn once.
+    """
+    progress = get_progress()
+    metrics.count("interview_reruns_total", scope="card")
+    try:
+        with metrics.timed("card", progress.session):
+            show_question(progress, questions)
+    finally:
+        # Fragment reruns skip the save at the end of run_interview
+        save_progress(progress)
+
+
+def save_all_answers(progress, questions):
+    """Offers every answer of the interview as a single ZIP download."""
+    from answer_archive import build_archive
+    from media_server import media_enabled, media_url
+
+    files = []
+    for q_index in range(len(questions)):
+        if progress.answer_path(q_index) is not None:
+            video_path, download_name, _ = best_answer_file(q_index, progress.answer(q_index))
+            files.append((video_path, download_name))
+    if not files:
+        return
+    if not media_enabled():
+        # The archive can be gigabytes and st.download_button would hold it in
+        # memory; without the media server every answer was saved on its own
+        return
+
+    st.write("📦 **Save all your answers in one file.**")
+    if st.button("Prepare ZIP of All Answers"):
+        with st.spinner("Packing your answers..."):
+            progress.archive_path = build_archive(progress.spool_id, files)
+
+    zip_path = progress.archive_path
+    if zip_path is None or not os.path.exists(zip_path):
+        return
+    # Streamed from disk by the media server, never loaded into memory
+    st.link_button("⬇️ Download All Answers (ZIP)", media_url(zip_path, download_name="Interview_Answers.zip"))
+
+
+def show_completion(progress, questions):
+    """Renders the end-of-interview screen."""
+    st.balloons()
+    st.success("🎉 Interview Completed! Thank you.")
+
+    save_all_answers(progress, questions)
+
+    if st.button("Start New Interview"):
+        reset_progress()
+        st.session_state.authenticated = False
+        st.rerun()
+
+
+# --- MAIN APP ---
+def run_interview(session, session_choices=None):
+    """Runs the whole interview flow for one question bank.
+
+    If session_choices is given, the candidate may switch between those
+    banks from the sidebar or with the ?session= query parameter.
+    """
+    # --- PAGE SETUP ---
+    st.set_page_config(page_title="Professor Ankit's AI Online Interview Preperation", page_icon="🤖")
+    metrics.count("interview_reruns_total", scope="page")
+
+    if session_choices:
+        session = session_picker(session, list(session_choices))
+
+    # --- LOGIN SYSTEM ---
+    # A candidate reconnecting with ?resume=<token> skips the login
+    restore_from_url()
+    require_login()
+
+    st.title("Professor Ankit's")
+    st.title("AI Online Interview Preperation")
+    st.write("")
+    st.write("This app will help you to practice recent CAS interview questions asked from the students. Please ensure that you may have working speakers/headset and a microphone. Please CLICK on the Play button to listen to the question, then record your answer by clicking on the microphone button.")
+    st.write("Once the answer is recorded then move to next question")
+
+    # Switching to another question bank starts a fresh interview
+    progress = get_progress()
+    if progress.session != session:
+        progress = reset_progress()
+        progress.session = session
+
+    # The candidate's questions: a whole bank, or their own mixed plan
+    questions = interview_plan(session, progress.plan_seed)
+    warn_lost_answers(progress)
+
+    # Check if interview is finished
+    try:
+        with metrics.timed("page", session):
+            if progress.q_index < len(questions):
+                question_card(questions)
+            else:
+                show_completion(progress, questions)
+    finally:
+        # Also runs when a button calls st.rerun()
+        save_progress(get_progress())
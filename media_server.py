@@ -0,0 +1,261 @@
+"""Stable, cacheable URLs for spooled answer files and stored answers.
+
+st.video(path) and st.download_button(data=...) read the whole file into
+memory on every rerun. Answers are instead served by a small HTTP server
+running inside the app process, under a signed URL that only changes when
+the file does. The browser keeps the video element and its cache across
+reruns, and playback, seeking and downloads stream straight from disk.
+Answers in a local answer store (see answer_store.py) are served the same
+way, for the evaluator dashboard.
+
+The server is opt-in, since browsers must be able to reach it. Without
+any of the settings below the app keeps playing and downloading answers
+through Streamlit itself. Behind a reverse proxy, either set
+INTERVIEW_MEDIA_BASE_URL to the address the proxy forwards to the media
+port, or forward /media/ on the app's own address and set
+INTERVIEW_BEHIND_PROXY=1 (see deploy/). With INTERVIEW_MEDIA_SERVER=1
+alone, the URLs point at INTERVIEW_MEDIA_PORT on the host the page was
+loaded from; that port must be open and the page must be plain HTTP,
+since browsers block plain-HTTP media on an HTTPS page.
+
+When several app processes share one spool (see deploy/), only one media
+server can own the port. Run it on its own with the shared secret:
+
+    INTERVIEW_MEDIA_SECRET=... python media_server.py
+
+and start the app processes with INTERVIEW_MEDIA_EMBEDDED=0.
+"""
+import hashlib
+import hmac
+import mimetypes
+import os
+import re
+import secrets
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+import metrics
+from answer_store import LocalAnswerStore, get_answer_store
+from upload_spool import SPOOL_DIR
+
+# --- CONFIGURATION ---
+MEDIA_BASE_URL = os.environ.get("INTERVIEW_MEDIA_BASE_URL", "").rstrip("/")
+# Browsers fetch the media port directly unless a proxy forwards /media/.
+# Every URL is signed, so only answers the app handed out can be fetched.
+MEDIA_HOST = os.environ.get("INTERVIEW_MEDIA_HOST", "0.0.0.0")
+MEDIA_PORT = int(os.environ.get("INTERVIEW_MEDIA_PORT", "8765"))
+# A reverse proxy forwards /media/ on the app's own address (see deploy/)
+BEHIND_PROXY = os.environ.get("INTERVIEW_BEHIND_PROXY", "0") == "1"
+# Serve media on INTERVIEW_MEDIA_PORT of the page's own host, without a proxy
+MEDIA_DIRECT = os.environ.get("INTERVIEW_MEDIA_SERVER", "0") == "1"
+
+# Processes that share a spool must share this secret to serve each other's URLs
+MEDIA_SECRET = os.environ.get("INTERVIEW_MEDIA_SECRET") or secrets.token_hex(32)
+
+# Start the server inside the app process; off when a standalone one serves the spool
+MEDIA_EMBEDDED = os.environ.get("INTERVIEW_MEDIA_EMBEDDED", "1") != "0"
+
+# Bytes copied per write while streaming a file
+COPY_CHUNK_SIZE = 64 * 1024
+
+_RANGE_PATTERN = re.compile(r"bytes=(\d*)-(\d*)$")
+_server = None
+_server_failed = False
+_server_lock = threading.Lock()
+
+
+def media_enabled():
+    """True when answers can be served from the media server.
+
+    False unless the deployment opted in (see the module docstring), or
+    when the embedded server could not bind its port, e.g. because another
+    app process on the machine holds it.
+    """
+    if not (MEDIA_BASE_URL or BEHIND_PROXY or MEDIA_DIRECT):
+        return False
+    return ensure_server() is not None or not MEDIA_EMBEDDED
+
+
+def media_base_url():
+    """Returns the address the browser reaches the media server at."""
+    if MEDIA_BASE_URL:
+        return MEDIA_BASE_URL
+    import streamlit as st
+
+    headers = st.context.headers
+    host = headers.get("Host") or "localhost"
+    if BEHIND_PROXY:
+        return f"{headers.get('X-Forwarded-Proto') or 'http'}://{host}"
+    hostname = urlsplit(f"//{host}").hostname or "localhost"
+    if ":" in hostname:
+        hostname = f"[{hostname}]"  # IPv6 address
+    return f"http://{hostname}:{MEDIA_PORT}"
+
+
+def media_roots():
+    """Returns {name: directory} of the folders files are served from."""
+    roots = {"spool": SPOOL_DIR}
+    store = get_answer_store()
+    if isinstance(store, LocalAnswerStore):
+        roots["store"] = store.root
+    return roots
+
+
+def _signature(relative_path, version):
+    message = f"{relative_path}|{version}".encode("utf-8")
+    return hmac.new(MEDIA_SECRET.encode("utf-8"), message, hashlib.sha256).hexdigest()[:32]
+
+
+def media_url(path, download_name=None):
+    """Returns a signed URL for a file in the spool or the local answer store.
+
+    The URL embeds the file's modification time, so it stays the same
+    across reruns and changes when the answer is replaced.
+    """
+    ensure_server()
+    real_path = os.path.realpath(path)
+    for name, root in media_roots().items():
+        root = os.path.realpath(root)
+        if real_path.startswith(root + os.sep):
+            relative_path = f"{name}/" + os.path.relpath(real_path, root).replace(os.sep, "/")
+            break
+    else:
+        raise ValueError(f"{path} is not in a folder the media server serves")
+    version = os.stat(path).st_mtime_ns
+    url = f"{media_base_url()}/media/{quote(relative_path)}?v={version}&sig={_signature(relative_path, version)}"
+    if download_name:
+        url += f"&download={quote(download_name)}"
+    return url
+
+
+def ensure_server():
+    """Starts the media server thread once per process.
+
+    Returns None if it is not embedded or its port could not be bound.
+    """
+    global _server, _server_failed
+    if not MEDIA_EMBEDDED or _server_failed:
+        return None
+    with _server_lock:
+        if _server is None and not _server_failed:
+            try:
+                _server = ThreadingHTTPServer((MEDIA_HOST, MEDIA_PORT), MediaRequestHandler)
+            except OSError as e:
+                _server_failed = True
+                print(f"Media server not started on {MEDIA_HOST}:{MEDIA_PORT}: {e}", file=sys.stderr)
+                return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="media-server", daemon=True).start()
+    return _server
+
+
+class MediaRequestHandler(BaseHTTPRequestHandler):
+    """Serves signed spool files with Range and caching headers."""
+
+    def do_HEAD(self):
+        self.handle_media(send_body=False)
+
+    def do_GET(self):
+        self.handle_media(send_body=True)
+
+    def log_message(self, format, *args):
+        # Keep the Streamlit console readable
+        pass
+
+    def handle_media(self, send_body):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        if not url.path.startswith("/media/"):
+            self.send_error(404)
+            return
+        relative_path = unquote(url.path[len("/media/"):])
+        version = query.get("v", [""])[0]
+        if not hmac.compare_digest(query.get("sig", [""])[0], _signature(relative_path, version)):
+            self.send_error(403)
+            return
+
+        root_name, _, relative_path = relative_path.partition("/")
+        root = media_roots().get(root_name)
+        if root is None:
+            self.send_error(404)
+            return
+        root = os.path.realpath(root)
+        path = os.path.realpath(os.path.join(root, relative_path))
+        if not path.startswith(root + os.sep) or not os.path.isfile(path):
+            self.send_error(404)
+            return
+        if version != str(os.stat(path).st_mtime_ns):
+            # The answer was replaced; its new URL has a new version
+            self.send_error(410)
+            return
+
+        size = os.path.getsize(path)
+        start, end = 0, size - 1
+        status = 200
+        range_header = self.headers.get("Range")
+        if range_header:
+            match = _RANGE_PATTERN.match(range_header.strip())
+            if match is None or match.group(1) == match.group(2) == "":
+                self.send_error(416)
+                return
+            if match.group(1) == "":
+                start = max(size - int(match.group(2)), 0)
+            else:
+                start = int(match.group(1))
+                if match.group(2) != "":
+                    end = min(int(match.group(2)), size - 1)
+            if start > end:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.end_headers()
+                return
+            status = 206
+
+        self.send_response(status)
+        self.send_header("Content-Type", mimetypes.guess_type(path)[0] or "application/octet-stream")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("Accept-Ranges", "bytes")
+        # The URL changes whenever the file does, so browsers may keep it
+        self.send_header("Cache-Control", "private, max-age=86400, immutable")
+        self.send_header("ETag", f'"{version}"')
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        download_name = query.get("download", [""])[0]
+        if download_name:
+            self.send_header("Content-Disposition", f"attachment; filename*=UTF-8''{quote(download_name)}")
+        self.end_headers()
+        if not send_body:
+            return
+
+        remaining = end - start + 1
+        try:
+            with open(path, "rb") as f:
+                f.seek(start)
+                while remaining > 0:
+                    chunk = f.read(min(COPY_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    try:
+                        self.wfile.write(chunk)
+                    except (BrokenPipeError, ConnectionResetError):
+                        # The browser stopped reading, e.g. after a seek
+                        return
+                    remaining -= len(chunk)
+        finally:
+            metrics.count("interview_served_bytes_total", end - start + 1 - remaining, via="media")
+
+
+def main():
+    """Runs the media server in the foreground, for multi-process deployments."""
+    if not os.environ.get("INTERVIEW_MEDIA_SECRET"):
+        raise SystemExit("Set INTERVIEW_MEDIA_SECRET to the secret the app processes use.")
+    server = ThreadingHTTPServer((MEDIA_HOST, MEDIA_PORT), MediaRequestHandler)
+    server.daemon_threads = True
+    print(f"Serving {', '.join(media_roots().values())} on {MEDIA_HOST}:{MEDIA_PORT}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
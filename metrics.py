@@ -0,0 +1,181 @@
+"""Timings and counters for the interview flow.
+
+The app records how long each stage of a question takes, how often the
+page and the question card rerun, and how many bytes are uploaded and
+served. Two outputs, both off by default:
+
+- INTERVIEW_METRICS_PORT: a Prometheus text endpoint on
+  http://127.0.0.1:<port>/metrics, served from a thread in the app process
+- INTERVIEW_METRICS_LOG: one JSON line per event appended to this file,
+  with the session and question of each stage timing
+
+Stages of a question (seconds):
+
+    answer     question shown -> answer received (thinking, recording, upload)
+    preview    drawing the answer player
+    download   answer received -> download button clicked
+    countdown  download clicked -> Next clicked (the verifying-save gate)
+    question   question shown -> Next clicked
+    page/card  drawing the page below the login, or the question card
+"""
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# --- CONFIGURATION ---
+METRICS_HOST = os.environ.get("INTERVIEW_METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.environ.get("INTERVIEW_METRICS_PORT", "0"))
+METRICS_LOG = os.environ.get("INTERVIEW_METRICS_LOG", "")
+
+# Histogram bucket bounds for stage timings (seconds)
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+_lock = threading.Lock()
+_counters = {}    # (name, labels) -> value
+_histograms = {}  # (name, labels) -> [bucket counts..., sum, count]
+_server = None
+_server_failed = False
+_log_lock = threading.Lock()
+
+HELP = {
+    "interview_stage_seconds": "Time spent in each stage of a question.",
+    "interview_reruns_total": "Full-page script runs, and draws of the question card (full or card-only runs).",
+    "interview_uploaded_bytes_total": "Answer bytes received from browsers.",
+    "interview_served_bytes_total": "Answer bytes sent to browsers.",
+    "interview_questions_completed_total": "Questions finished with the Next button.",
+}
+
+
+def metrics_enabled():
+    return bool(METRICS_PORT or METRICS_LOG)
+
+
+def _labels(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _log(event):
+    if not METRICS_LOG:
+        return
+    event["time"] = round(time.time(), 3)
+    line = json.dumps(event) + "\n"
+    with _log_lock, open(METRICS_LOG, "a", encoding="utf-8") as f:
+        f.write(line)
+
+
+def count(name, amount=1, **labels):
+    """Adds to a counter, e.g. count("interview_reruns_total", scope="card")."""
+    if not metrics_enabled():
+        return
+    ensure_server()
+    key = (name, _labels(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+    _log(dict(labels, counter=name, amount=amount))
+
+
+def observe(stage, seconds, session=None, q_index=None):
+    """Records one stage timing. session and q_index go to the log only."""
+    if not metrics_enabled() or seconds is None or seconds < 0:
+        return
+    ensure_server()
+    key = ("interview_stage_seconds", _labels({"stage": stage, "session": session or ""}))
+    with _lock:
+        histogram = _histograms.setdefault(key, [0] * (len(BUCKETS) + 2))
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                histogram[i] += 1
+        histogram[-2] += seconds
+        histogram[-1] += 1
+    _log({"stage": stage, "seconds": round(seconds, 4), "session": session, "question": q_index})
+
+
+def since(started, stage, session=None, q_index=None):
+    """Records the time from a stored timestamp until now, if there is one."""
+    if started is not None:
+        observe(stage, time.time() - started, session, q_index)
+
+
+@contextmanager
+def timed(stage, session=None, q_index=None):
+    """Times the body of a with-block as one stage."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - start, session, q_index)
+
+
+# --- PROMETHEUS ENDPOINT ---
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}"
+
+
+def render():
+    """Returns every metric in the Prometheus text format."""
+    lines = []
+    with _lock:
+        counters = dict(_counters)
+        histograms = {key: list(value) for key, value in _histograms.items()}
+    for name in sorted({name for name, _ in counters}):
+        lines += [f"# HELP {name} {HELP.get(name, name)}", f"# TYPE {name} counter"]
+        for (metric, labels), value in sorted(counters.items()):
+            if metric == name:
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+    if histograms:
+        name = "interview_stage_seconds"
+        lines += [f"# HELP {name} {HELP[name]}", f"# TYPE {name} histogram"]
+        for (_, labels), values in sorted(histograms.items()):
+            for bound, bucket_count in zip(BUCKETS, values):
+                lines.append(f"{name}_bucket{_format_labels(labels, [('le', bound)])} {bucket_count}")
+            lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {values[-1]}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {values[-2]:.6f}")
+            lines.append(f"{name}_count{_format_labels(labels)} {values[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+def ensure_server():
+    """Starts the metrics endpoint thread once per process, if a port is set.
+
+    Returns None if its port could not be bound, e.g. because another app
+    process holds it; counting and the log go on without the endpoint.
+    """
+    global _server, _server_failed
+    if not METRICS_PORT or _server is not None or _server_failed:
+        return _server
+    with _lock:
+        if _server is None and not _server_failed:
+            try:
+                _server = ThreadingHTTPServer((METRICS_HOST, METRICS_PORT), MetricsRequestHandler)
+            except OSError as e:
+                _server_failed = True
+                print(f"Metrics endpoint not started on {METRICS_HOST}:{METRICS_PORT}: {e}", file=sys.stderr)
+                return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+    return _server
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Serves GET /metrics."""
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
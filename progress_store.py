@@ -0,0 +1,86 @@
+"""SQLite-backed copy of each interview's progress.
+
+Every saved interview is kept under a random resume token, which the app
+puts in the page URL (?resume=<token>). After a dropped connection or a
+page refresh the token brings the candidate back to the same question
+with the same answers, without uploading anything again.
+
+A saved interview lives as long as its spool: the session sweeper (see
+session_manager.py) deletes both once the interview has been idle for
+INTERVIEW_SESSION_TTL, two hours by default. PROGRESS_TTL only clears
+rows whose spool was never created.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from upload_spool import SPOOL_DIR
+
+# --- CONFIGURATION ---
+PROGRESS_DB = os.environ.get("INTERVIEW_PROGRESS_DB", os.path.join(SPOOL_DIR, "progress.sqlite3"))
+
+# Saved interviews untouched for this long are deleted (seconds), even
+# without a spool for the sweeper to find
+PROGRESS_TTL = int(os.environ.get("INTERVIEW_PROGRESS_TTL", 24 * 60 * 60))
+
+_local = threading.local()
+
+
+def _connect():
+    """Returns this thread's connection, creating the database on first use."""
+    connection = getattr(_local, "connection", None)
+    if connection is None:
+        os.makedirs(os.path.dirname(os.path.abspath(PROGRESS_DB)), exist_ok=True)
+        connection = sqlite3.connect(PROGRESS_DB, timeout=10)
+        # WAL lets several app processes read while one writes
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS progress ("
+            " token TEXT PRIMARY KEY,"
+            " data TEXT NOT NULL,"
+            " updated REAL NOT NULL)"
+        )
+        _local.connection = connection
+    return connection
+
+
+def save(token, data):
+    """Stores (or replaces) the progress saved under a token."""
+    connection = _connect()
+    with connection:
+        connection.execute(
+            "INSERT INTO progress (token, data, updated) VALUES (?, ?, ?)"
+            " ON CONFLICT(token) DO UPDATE SET data = excluded.data, updated = excluded.updated",
+            (token, json.dumps(data), time.time()),
+        )
+
+
+def load(token):
+    """Returns the progress saved under a token, or None."""
+    row = _connect().execute("SELECT data FROM progress WHERE token = ?", (token,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def delete(token):
+    """Forgets a saved interview."""
+    connection = _connect()
+    with connection:
+        connection.execute("DELETE FROM progress WHERE token = ?", (token,))
+
+
+def delete_spool(spool_id):
+    """Forgets the saved interviews whose answers are in a spool."""
+    connection = _connect()
+    with connection:
+        connection.execute("DELETE FROM progress WHERE json_extract(data, '$.progress.spool_id') = ?", (spool_id,))
+
+
+def purge_expired(ttl=PROGRESS_TTL):
+    """Deletes saved interviews that have not been updated for ttl seconds."""
+    connection = _connect()
+    with connection:
+        cursor = connection.execute("DELETE FROM progress WHERE updated < ?", (time.time() - ttl,))
+    return cursor.rowcount
@@ -0,0 +1,132 @@
+import json
+import os
+import random
+from collections import namedtuple
+from functools import lru_cache
+from types import MappingProxyType
+
+# --- CONFIGURATION ---
+# Question banks live next to this file as question_banks/<session>.json
+QUESTION_BANK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "question_banks")
+
+# A bank may set "answer_mode": "audio" to collect spoken answers without video
+ANSWER_MODES = ("video", "audio")
+
+# A bank may also give scoring rubrics (see scoring.py), keyed by question number:
+#   "rubrics": {"10": {"keywords": [["20", "twenty"]], "min_words": 10}}
+QuestionBank = namedtuple("QuestionBank", ["title", "questions", "answer_mode", "rubrics"])
+
+# One question of an interview plan: which bank it comes from, and where
+QuestionRef = namedtuple("QuestionRef", ["session", "index", "text"])
+
+# The pseudo-session "mixed" draws a few questions from every bank. Quotas
+# per bank, e.g. INTERVIEW_MIXED_QUOTAS="session1=3,session4=7"
+MIXED_SESSION = "mixed"
+MIXED_TITLE = "Mixed: Questions from Every Session"
+MIXED_QUOTAS = os.environ.get("INTERVIEW_MIXED_QUOTAS", "")
+DEFAULT_MIXED_QUOTA = 5
+
+
+@lru_cache(maxsize=None)
+def list_sessions():
+    """Returns the names of all question banks, e.g. ('session1', ...)."""
+    names = [f[:-len(".json")] for f in os.listdir(QUESTION_BANK_DIR) if f.endswith(".json")]
+    return tuple(sorted(names))
+
+
+@lru_cache(maxsize=None)
+def load_bank(session):
+    """Reads a question bank file once per process."""
+    with open(os.path.join(QUESTION_BANK_DIR, f"{session}.json"), encoding="utf-8") as f:
+        bank = json.load(f)
+    answer_mode = bank.get("answer_mode", "video")
+    if answer_mode not in ANSWER_MODES:
+        raise ValueError(f"{session}: answer_mode must be one of {ANSWER_MODES}")
+    questions = tuple(bank["questions"])
+    rubrics = bank.get("rubrics", {})
+    return QuestionBank(
+        bank["title"],
+        questions,
+        answer_mode,
+        tuple(rubrics.get(str(number)) for number in range(1, len(questions) + 1)),
+    )
+
+
+def load_questions(session):
+    """Returns the questions of a bank as a tuple."""
+    return load_bank(session).questions
+
+
+def load_rubric(session, q_index):
+    """Returns the rubric for one question, or None if the bank has none."""
+    rubrics = load_bank(session).rubrics
+    return rubrics[q_index] if q_index < len(rubrics) else None
+
+
+def session_title(session):
+    return MIXED_TITLE if session == MIXED_SESSION else load_bank(session).title
+
+
+# --- INTERVIEW PLANS ---
+class QuestionIndex:
+    """Every question of every bank, built once per process and never changed.
+
+    by_session maps a bank to its questions as a tuple of QuestionRef, so a
+    plan is just a tuple of references into these shared tuples.
+    """
+
+    __slots__ = ("sessions", "by_session")
+
+    def __init__(self, sessions):
+        self.sessions = tuple(sessions)
+        self.by_session = MappingProxyType({
+            session: tuple(QuestionRef(session, i, text) for i, text in enumerate(load_questions(session)))
+            for session in self.sessions
+        })
+
+    def plan(self, quotas, seed):
+        """Draws quota questions from each bank, in a seeded random order.
+
+        random.sample over a range picks k indexes without copying the
+        bank, so building a plan costs O(plan size).
+        """
+        rng = random.Random(seed)
+        plan = []
+        for session, quota in quotas:
+            refs = self.by_session[session]
+            plan.extend(refs[i] for i in rng.sample(range(len(refs)), min(quota, len(refs))))
+        rng.shuffle(plan)
+        return tuple(plan)
+
+
+@lru_cache(maxsize=None)
+def question_index():
+    return QuestionIndex(list_sessions())
+
+
+@lru_cache(maxsize=None)
+def mixed_quotas():
+    """Returns ((session, quota), ...) for the mixed interview."""
+    if not MIXED_QUOTAS:
+        return tuple((session, DEFAULT_MIXED_QUOTA) for session in list_sessions())
+    quotas = []
+    for item in MIXED_QUOTAS.split(","):
+        session, _, quota = item.strip().partition("=")
+        if session not in list_sessions():
+            raise ValueError(f"INTERVIEW_MIXED_QUOTAS: unknown session {session!r}")
+        quotas.append((session, int(quota)))
+    return tuple(quotas)
+
+
+@lru_cache(maxsize=4096)
+def interview_plan(session, seed):
+    """Returns the questions of one candidate's interview, as QuestionRefs.
+
+    A bank is asked in full and in order; the mixed interview is drawn
+    from every bank with the candidate's seed, so a resumed interview gets
+    the same questions. Plans are cached, so reruns never rebuild them.
+    """
+    index = question_index()
+    if session == MIXED_SESSION:
+        return index.plan(mixed_quotas(), seed)
+    return index.by_session[session]
@@ -0,0 +1,160 @@
+import base64
+import os
+import re
+import time
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+import metrics
+from upload_spool import DuplicateAnswer, SpoolQuotaExceeded, append_recording_chunk, finish_recording
+
+# --- CONFIGURATION ---
+RECORDER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend", "answer_recorder")
+UPLOADER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend", "answer_uploader")
+
+# Milliseconds of media per chunk, and the bitrates the browser records at
+CHUNK_MS = 1000
+VIDEO_BITS_PER_SECOND = 1_000_000
+# Opus/AAC speech in audio-only mode: about 240 KB per minute
+AUDIO_BITS_PER_SECOND = 32_000
+
+# Uploaded videos above this height or bitrate are shrunk in the browser first
+UPLOAD_MAX_HEIGHT = 720
+# Bytes per chunk when a file is uploaded as it is
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# A recording or upload with no chunk for this long counts as abandoned (seconds)
+RECEIVE_TIMEOUT = 30
+
+_RECORDING_ID = re.compile(r"[0-9a-f]{8,32}")
+_recorder = components.declare_component("answer_recorder", path=RECORDER_DIR)
+_uploader = components.declare_component("answer_uploader", path=UPLOADER_DIR)
+
+
+def recording_extension(mime, extension=None, allowed=()):
+    """Picks the file extension for the container the browser sent.
+
+    A file uploaded as it is keeps its own extension, if it is allowed.
+    """
+    if extension and extension.lstrip(".") in allowed:
+        return extension
+    if mime.startswith("audio/mp4"):
+        return ".m4a"
+    return ".mp4" if mime.startswith("video/mp4") else ".webm"
+
+
+def receive_chunk(message, progress, spool_id, q_index, source="recording", extensions=()):
+    """Spools one chunk message if it is the next one expected.
+
+    Chunks arrive one at a time: the browser only sends the next chunk
+    after the server has acknowledged this one, and resends a chunk that
+    was not acknowledged, so duplicates are simply skipped here.
+    Returns the answer path once the final chunk has arrived.
+    """
+    if message["seq"] != progress["next_seq"]:
+        return None
+    progress["next_seq"] += 1
+    progress["updated"] = time.time()
+    if message["final"]:
+        progress["done"] = True
+        extension = recording_extension(message.get("mime", ""), message.get("ext"), extensions)
+        return finish_recording(spool_id, q_index, progress["id"], extension)
+    data = base64.b64decode(message["data"])
+    append_recording_chunk(spool_id, q_index, progress["id"], data)
+    metrics.count("interview_uploaded_bytes_total", len(data), source=source)
+    return None
+
+
+def _receive(key, spool_id, q_index, answer, source, extensions=()):
+    """Takes in the latest chunk message of a component, if any.
+
+    The receiving state is kept on the question's AnswerState, per
+    component key, so a stray message from the recorder cannot take over
+    an upload in progress (or the other way round). Returns (state, path
+    of the finished file or None). A file with the same content as an
+    answer already spooled is not kept; the path of that earlier answer
+    is returned instead.
+    """
+    if answer.recording is None:
+        answer.recording = {}
+    progress = answer.recording.get(key)
+    message = st.session_state.get(key)
+    finished = None
+
+    # The latest chunk is read from session state before the component is
+    # drawn, so this run can already acknowledge it
+    if message and _RECORDING_ID.fullmatch(str(message.get("rec", ""))):
+        if message["seq"] == 0 and (progress is None or progress["id"] != message["rec"]):
+            progress = {"id": message["rec"], "next_seq": 0, "error": None, "updated": time.time(), "done": False}
+            answer.recording[key] = progress
+        if progress is not None and progress["id"] == message["rec"] and not progress["error"]:
+            try:
+                finished = receive_chunk(message, progress, spool_id, q_index, source, extensions)
+            except SpoolQuotaExceeded as e:
+                progress["error"] = str(e)
+            except DuplicateAnswer as e:
+                finished = e.path
+    return progress, finished
+
+
+def receiving(answer):
+    """True while a new recording or upload for the question is arriving."""
+    return any(
+        progress["next_seq"] > 0
+        and not progress["done"]
+        and not progress["error"]
+        and time.time() - progress["updated"] < RECEIVE_TIMEOUT
+        for progress in (answer.recording or {}).values()
+    )
+
+
+def _ack_args(progress):
+    return {
+        "ack_rec": progress["id"] if progress else "",
+        "ack_seq": progress["next_seq"] - 1 if progress else -1,
+        "error": progress["error"] if progress else None,
+    }
+
+
+def answer_recorder(key, spool_id, q_index, answer, audio_only=False):
+    """Records the answer in the browser while streaming it to the spool.
+
+    With audio_only the browser records compressed speech (Opus, or AAC
+    on Safari) without the camera. Returns the path of the finished
+    recording once its last chunk has been received, otherwise None.
+    """
+    progress, finished = _receive(key, spool_id, q_index, answer, "recording")
+    _recorder(
+        key=key,
+        chunk_ms=CHUNK_MS,
+        video_bps=VIDEO_BITS_PER_SECOND,
+        audio_only=audio_only,
+        audio_bps=AUDIO_BITS_PER_SECOND,
+        default=None,
+        **_ack_args(progress),
+    )
+    return finished
+
+
+def answer_uploader(key, spool_id, q_index, answer, types, audio_only=False):
+    """Uploads a chosen file in acknowledged chunks, shrinking videos first.
+
+    A video taller than UPLOAD_MAX_HEIGHT or above the recording bitrate
+    is re-encoded in the browser (played into a canvas and recorded with
+    MediaRecorder) while it uploads; anything else, and any browser that
+    cannot re-encode, sends the file as it is. Lost chunks are resent, as
+    with the recorder. types lists the file extensions accepted, e.g.
+    ['mp4', 'mov']. Returns the path of the finished file, otherwise None.
+    """
+    progress, finished = _receive(key, spool_id, q_index, answer, "upload", types)
+    _uploader(
+        key=key,
+        types=list(types),
+        audio_only=audio_only,
+        max_height=UPLOAD_MAX_HEIGHT,
+        video_bps=VIDEO_BITS_PER_SECOND,
+        chunk_bytes=UPLOAD_CHUNK_BYTES,
+        default=None,
+        **_ack_args(progress),
+    )
+    return finished
@@ -0,0 +1,224 @@
+"""Automatic first-pass scoring of transcribed answers.
+
+Every transcript in the index built by transcribe.py is scored against its
+question with a small rule engine that runs on the CPU:
+
+- relevance: how many of the question's content words the answer picks up
+- coverage: how many of the rubric's required points are mentioned
+- length: whether the answer is neither a one-liner nor a monologue
+- fluency: how much of it is filler ("um", "uh", ...)
+
+Rubrics are optional and live in the question bank (see question_bank.py).
+Scores are cached by a hash of the question, rubric and transcript, so
+rescoring unchanged answers is free and an edited rubric rescored only
+the answers it affects.
+
+    python transcribe.py --model ...     # first
+    python scoring.py --workers 4
+    python scoring.py --show session4
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import transcribe
+from question_bank import list_sessions, load_rubric
+
+# --- CONFIGURATION ---
+SCORES_DB = os.environ.get(
+    "INTERVIEW_SCORES_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "scores.sqlite3"),
+)
+# Answers handed to a worker process at a time
+BATCH_SIZE = int(os.environ.get("INTERVIEW_SCORING_BATCH", 64))
+
+# Bump when the scoring rules change, so cached scores are recomputed
+ENGINE_VERSION = 1
+
+# Used when a question has no rubric, or the rubric leaves them out
+DEFAULT_MIN_WORDS = 25
+DEFAULT_MAX_WORDS = 250
+WEIGHTS = {"relevance": 30, "coverage": 40, "length": 20, "fluency": 10}
+
+FILLER_WORDS = frozenset(["um", "uh", "erm", "er", "hmm", "ah"])
+STOP_WORDS = frozenset("""
+    a about after all an and any are as at be by can do does for from have how i if in is it
+    its of on or so that the their them there these they this to was what when where which who
+    why will with would you your yours
+""".split())
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def connect(path=SCORES_DB):
+    """Opens the score database, creating it on first use."""
+    connection = sqlite3.connect(path, timeout=10)
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS score_cache ("
+        " answer_hash TEXT PRIMARY KEY, score REAL NOT NULL, details TEXT NOT NULL)"
+    )
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS scores ("
+        " key TEXT PRIMARY KEY, candidate TEXT, session TEXT, question_index INTEGER,"
+        " answer_hash TEXT NOT NULL)"
+    )
+    return connection
+
+
+def answer_hash(question, rubric, text):
+    """Identifies one scoring input; equal hashes always get equal scores."""
+    payload = json.dumps([ENGINE_VERSION, question, rubric, text], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# --- RULE ENGINE ---
+def words(text):
+    return _WORD.findall(text.lower())
+
+
+def _mentions(text, alternatives):
+    """True if the text contains any of the phrases, as whole words."""
+    return any(re.search(rf"\b{re.escape(phrase.lower())}\b", text) for phrase in alternatives)
+
+
+def score_answer(question, rubric, text):
+    """Scores one transcript out of 100. Returns (score, details)."""
+    rubric = rubric or {}
+    answer_words = words(text)
+    lowered = " ".join(answer_words)
+    count = len(answer_words)
+
+    topic = {word for word in words(question) if word not in STOP_WORDS}
+    relevance = len(topic & set(answer_words)) / len(topic) if topic else 1.0
+    # Mentioning about half of the question's own words is already on topic
+    relevance = min(1.0, relevance * 2)
+
+    points = rubric.get("keywords", [])
+    missing = [alternatives[0] for alternatives in points if not _mentions(lowered, alternatives)]
+    coverage = 1 - len(missing) / len(points) if points else relevance
+
+    min_words = rubric.get("min_words", DEFAULT_MIN_WORDS)
+    max_words = rubric.get("max_words", DEFAULT_MAX_WORDS)
+    if count < min_words:
+        length = count / min_words
+    elif count > max_words:
+        length = max(0.0, 1 - (count - max_words) / max_words)
+    else:
+        length = 1.0
+
+    fillers = sum(word in FILLER_WORDS for word in answer_words)
+    fluency = max(0.0, 1 - 5 * fillers / count) if count else 0.0
+
+    parts = {"relevance": relevance, "coverage": coverage, "length": length, "fluency": fluency}
+    score = 0.0 if count == 0 else sum(WEIGHTS[name] * value for name, value in parts.items())
+    details = {name: round(value, 2) for name, value in parts.items()}
+    details.update(words=count, missing=missing)
+    return round(score, 1), details
+
+
+def score_batch(items):
+    """Worker entry point: scores a list of (answer_hash, question, rubric, text)."""
+    return [(digest,) + score_answer(question, rubric, text) for digest, question, rubric, text in items]
+
+
+# --- BATCH RUN ---
+def pending_answers(transcripts, connection):
+    """Returns the transcripts to (re)score and the scoring inputs of each.
+
+    Yields (key, candidate, session, question_index, answer_hash, question,
+    rubric, text) for every transcript whose current hash is not mapped yet.
+    """
+    mapped = dict(connection.execute("SELECT key, answer_hash FROM scores"))
+    sessions = set(list_sessions())
+    rows = transcripts.execute("SELECT key, candidate, session, question_index, question, text FROM transcripts")
+    for key, candidate, session, q_index, question, text in rows:
+        q_index = int(q_index)
+        rubric = load_rubric(session, q_index) if session in sessions else None
+        digest = answer_hash(question, rubric, text)
+        if mapped.get(key) != digest:
+            yield key, candidate, session, q_index, digest, question, rubric, text
+
+
+def score_all(workers):
+    """Scores every new or changed transcript, reusing cached scores."""
+    connection = connect()
+    cached = {digest for (digest,) in connection.execute("SELECT answer_hash FROM score_cache")}
+    pending = list(pending_answers(transcribe.connect(), connection))
+
+    # Identical inputs (e.g. an answer uploaded twice) are scored once
+    work = {}
+    for _, _, _, _, digest, question, rubric, text in pending:
+        if digest not in cached:
+            work[digest] = (digest, question, rubric, text)
+    work = list(work.values())
+    batches = [work[i:i + BATCH_SIZE] for i in range(0, len(work), BATCH_SIZE)]
+    print(f"{len(pending)} answers changed, {len(work)} to score in {len(batches)} batches")
+
+    if batches:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for results in pool.map(score_batch, batches):
+                with connection:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO score_cache (answer_hash, score, details) VALUES (?, ?, ?)",
+                        [(digest, score, json.dumps(details)) for digest, score, details in results],
+                    )
+    with connection:
+        connection.executemany(
+            "INSERT OR REPLACE INTO scores (key, candidate, session, question_index, answer_hash)"
+            " VALUES (?, ?, ?, ?, ?)",
+            [row[:5] for row in pending],
+        )
+    return 0
+
+
+def get_score(key, connection=None):
+    """Returns (score, details) for one stored answer, or None if not scored."""
+    connection = connection or connect()
+    row = connection.execute(
+        "SELECT c.score, c.details FROM scores s JOIN score_cache c USING (answer_hash) WHERE s.key = ?",
+        (key,),
+    ).fetchone()
+    return (row[0], json.loads(row[1])) if row else None
+
+
+def forget_scores(keys, connection=None):
+    """Deletes the scores of answers that are no longer stored.
+
+    Cached scores stay, since another answer may have the same inputs.
+    """
+    connection = connection or connect()
+    with connection:
+        connection.executemany("DELETE FROM scores WHERE key = ?", [(key,) for key in keys])
+
+
+def session_report(session, connection=None):
+    """Returns (candidate, answers scored, average score) rows, best first."""
+    connection = connection or connect()
+    return connection.execute(
+        "SELECT s.candidate, COUNT(*), ROUND(AVG(c.score), 1)"
+        " FROM scores s JOIN score_cache c USING (answer_hash)"
+        " WHERE s.session = ? GROUP BY s.candidate ORDER BY AVG(c.score) DESC",
+        (session,),
+    ).fetchall()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score transcribed answers or show a session's results.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--show", metavar="SESSION", help="print the candidates of a session, best first")
+    args = parser.parse_args(argv)
+
+    if args.show:
+        for candidate, answered, average in session_report(args.show):
+            print(f"{candidate}: {average} ({answered} answers)")
+        return 0
+    return score_all(args.workers)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+"""Per-candidate interview state and clean-up of abandoned sessions.
+
+All progress of one interview lives in a single InterviewProgress object
+in st.session_state, instead of a handful of keys per question. Every
+rerun touches a marker file in the session's spool directory; a
+background sweeper deletes the spool of any session that has been idle
+for longer than INTERVIEW_SESSION_TTL seconds. The marker is a file, not
+an in-memory registry, so the sweep also works when several app
+processes share one spool.
+
+A copy of the progress is saved to the progress store under a resume
+token that is kept in the page URL, so a reconnecting candidate picks up
+where they left off. The sweeper deletes that copy together with the
+spool, so an interview can be resumed, answers and all, until it has
+been idle for INTERVIEW_SESSION_TTL (two hours by default).
+"""
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+
+import streamlit as st
+
+import answer_store
+import progress_store
+import transcode
+from upload_spool import SPOOL_DIR, clear_session_spool, new_spool_id, session_spool_dir
+
+# --- CONFIGURATION ---
+SESSION_TTL = int(os.environ.get("INTERVIEW_SESSION_TTL", 2 * 60 * 60))
+SWEEP_INTERVAL = int(os.environ.get("INTERVIEW_SWEEP_INTERVAL", 5 * 60))
+
+# Marker file whose modification time is the session's last activity
+LAST_SEEN_FILE = ".last_seen"
+# Do not touch the marker more often than this (seconds)
+TOUCH_INTERVAL = 30
+
+_sweeper = None
+_sweeper_lock = threading.Lock()
+
+
+@dataclass
+class AnswerState:
+    """Everything the app tracks about the answer to one question."""
+    path: str = None            # spooled answer file
+    saved: bool = False         # download button clicked
+    deadline: float = None      # when the save countdown ends
+    stored_key: str = None      # key in the server-side answer store
+    store_job: str = None       # background write to the answer store
+    transcode_job: str = None   # background compression job
+    recording: dict = None      # recordings and uploads being received, by component key
+    shown_at: float = None      # when the question was first shown
+    answered_at: float = None   # when this answer was received
+    saved_at: float = None      # when the download button was first clicked
+
+
+@dataclass
+class InterviewProgress:
+    """The whole state of one candidate's interview."""
+    session: str = None
+    plan_seed: int = field(default_factory=lambda: secrets.randbits(32))  # picks a mixed interview's questions
+    spool_id: str = field(default_factory=new_spool_id)
+    q_index: int = 0
+    uploader_round: int = 0
+    answers: dict = field(default_factory=dict)
+    archive_path: str = None
+    resume_token: str = field(default_factory=lambda: secrets.token_urlsafe(24))
+    # Not saved: bookkeeping for this process only
+    last_touch: float = 0.0
+    saved_snapshot: str = None
+
+    def answer(self, q_index):
+        """Returns the state of a question's answer, creating it if needed."""
+        if q_index not in self.answers:
+            self.answers[q_index] = AnswerState()
+        return self.answers[q_index]
+
+    def answer_path(self, q_index):
+        """Returns the spooled answer file, or None if there is none (any more)."""
+        answer = self.answers.get(q_index)
+        if answer is None or answer.path is None or not os.path.exists(answer.path):
+            return None
+        return answer.path
+
+    def replace_answer(self, q_index, path):
+        """Starts a fresh AnswerState for a newly recorded or uploaded file."""
+        old = self.answers.get(q_index)
+        if old is not None and old.transcode_job:
+            transcode.forget(old.transcode_job)
+        # The question has been on screen since before the first answer
+        shown_at = old.shown_at if old is not None else None
+        self.answers[q_index] = AnswerState(path=path, shown_at=shown_at, answered_at=time.time())
+        self.archive_path = None
+        return self.answers[q_index]
+
+    def to_dict(self):
+        """Returns the part of the progress worth saving, as plain data."""
+        data = asdict(self)
+        for key in ("last_touch", "saved_snapshot"):
+            del data[key]
+        for answer in data["answers"].values():
+            # A half-received recording cannot be resumed by a new page
+            answer["recording"] = None
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        answers = {int(q): AnswerState(**answer) for q, answer in data.pop("answers").items()}
+        return cls(answers=answers, **data)
+
+
+def lost_answers(progress):
+    """Returns the questions whose spooled answer is gone, e.g. after a very long break."""
+    return [
+        q_index for q_index, answer in sorted(progress.answers.items())
+        if answer.path is not None and not os.path.exists(answer.path)
+    ]
+
+
+def get_progress():
+    """Returns this browser session's interview progress."""
+    if "progress" not in st.session_state:
+        st.session_state.progress = InterviewProgress()
+    progress = st.session_state.progress
+    touch_session(progress)
+    return progress
+
+
+def restore_from_url():
+    """Restores a saved interview named by ?resume=<token>, if this session has none.
+
+    Returns True when an interview was restored. The token stands in for
+    the password, because it is only ever issued after a successful login.
+    """
+    token = st.query_params.get("resume")
+    if not token or "progress" in st.session_state:
+        return False
+    saved = progress_store.load(token)
+    if saved is None:
+        del st.query_params["resume"]
+        return False
+    st.session_state.candidate_name = saved["candidate_name"]
+    st.session_state.progress = InterviewProgress.from_dict(saved["progress"])
+    st.session_state.authenticated = True
+    return True
+
+
+def save_progress(progress):
+    """Saves the progress of a logged-in candidate if it changed since the last save."""
+    if not st.session_state.get("authenticated"):
+        return
+    data = {"candidate_name": st.session_state.get("candidate_name"), "progress": progress.to_dict()}
+    snapshot = json.dumps(data, sort_keys=True)
+    if snapshot != progress.saved_snapshot:
+        progress_store.save(progress.resume_token, data)
+        progress.saved_snapshot = snapshot
+    if st.query_params.get("resume") != progress.resume_token:
+        st.query_params["resume"] = progress.resume_token
+
+
+def touch_session(progress):
+    """Marks the session as active so the sweeper leaves its spool alone."""
+    now = time.time()
+    if now - progress.last_touch < TOUCH_INTERVAL:
+        return
+    progress.last_touch = now
+    marker = os.path.join(session_spool_dir(progress.spool_id), LAST_SEEN_FILE)
+    with open(marker, "a"):
+        os.utime(marker, None)
+    ensure_sweeper()
+
+
+def release_progress(progress):
+    """Frees everything an interview holds: jobs and spooled files."""
+    transcode.forget_owner(progress.spool_id)
+    answer_store.forget_owner(progress.spool_id)
+    clear_session_spool(progress.spool_id)
+    progress_store.delete(progress.resume_token)
+
+
+def reset_progress():
+    """Throws away the current interview and starts an empty one."""
+    if "progress" in st.session_state:
+        release_progress(st.session_state.progress)
+    st.query_params.pop("resume", None)
+    st.session_state.progress = InterviewProgress()
+    return get_progress()
+
+
+def sweep_idle_sessions(ttl=SESSION_TTL):
+    """Deletes the spool and saved progress of every session idle for longer than ttl seconds.
+
+    Both go at once, so a resume token never brings back an interview
+    whose answers are gone.
+    """
+    if not os.path.isdir(SPOOL_DIR):
+        return 0
+    cutoff = time.time() - ttl
+    evicted = 0
+    for entry in os.scandir(SPOOL_DIR):
+        if not entry.is_dir():
+            continue
+        marker = os.path.join(entry.path, LAST_SEEN_FILE)
+        try:
+            last_seen = os.path.getmtime(marker)
+        except FileNotFoundError:
+            last_seen = entry.stat().st_mtime
+        if last_seen < cutoff:
+            transcode.forget_owner(entry.name)
+            answer_store.forget_owner(entry.name)
+            # Also drops the running hashes of recordings that never finished
+            clear_session_spool(entry.name)
+            progress_store.delete_spool(entry.name)
+            evicted += 1
+    return evicted
+
+
+def _sweep_forever():
+    while True:
+        time.sleep(SWEEP_INTERVAL)
+        try:
+            sweep_idle_sessions()
+            progress_store.purge_expired()
+        except (OSError, sqlite3.Error):
+            pass  # Try again on the next round
+
+
+def ensure_sweeper():
+    """Starts the idle-session sweeper thread once per process."""
+    global _sweeper
+    with _sweeper_lock:
+        if _sweeper is None:
+            _sweeper = threading.Thread(target=_sweep_forever, name="session-sweeper", daemon=True)
+            _sweeper.start()
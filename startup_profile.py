@@ -0,0 +1,141 @@
+"""Cold-start profile of the interview app.
+
+Reports, each measured in a fresh Python process:
+
+- import time of the app's modules (python -X importtime), split into what
+  the login page needs and what is deferred until after login
+- time to first render: the login page of a SessionN.py script
+- time from the login click to the first question card
+
+    python startup_profile.py --script Session1.py > startup_report.txt
+
+Rendering is driven with streamlit.testing.v1.AppTest, like benchmark.py,
+so the numbers exclude the browser and the network.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Modules reported one by one in the import breakdown
+TOP_IMPORTS = 15
+
+
+def importtime(code):
+    """Runs code in a fresh interpreter; returns its imports as (depth, module, cumulative seconds).
+
+    Depth 1 is an import the code made itself. python -X importtime lists
+    a module after everything it imported, so the deeper entries right
+    before a module are its nested imports.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        # One space before a top-level name, two more per level of nesting
+        depth = (len(name) - len(name.lstrip(" ")) + 1) // 2
+        imports.append((depth, name.strip(), int(cumulative) / 1e6))
+    return imports
+
+
+def top_level(imports):
+    """Returns {module: cumulative seconds} of the imports the code made itself."""
+    return {name: seconds for depth, name, seconds in imports if depth == 1}
+
+
+def imported_by(imports, module):
+    """Returns {module: cumulative seconds} of what module imported directly."""
+    for position, (depth, name, _) in enumerate(imports):
+        if name == module:
+            break
+    else:
+        return {}
+    direct = {}
+    for nested_depth, name, seconds in reversed(imports[:position]):
+        if nested_depth <= depth:
+            break
+        if nested_depth == depth + 1:
+            direct[name] = seconds
+    return direct
+
+
+def render_times(script, password):
+    """Child process: times the login page and the first question card."""
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    streamlit_import = time.perf_counter() - start
+    at = AppTest.from_file(script, default_timeout=60)
+    start = time.perf_counter()
+    at.run()
+    login_page = time.perf_counter() - start
+
+    at.text_input[0].input(password)
+    start = time.perf_counter()
+    at.button[0].click().run()
+    first_question = time.perf_counter() - start
+    return {
+        "streamlit_import": streamlit_import,
+        "login_page": login_page,
+        "first_question": first_question,
+        "errors": [str(e.value) for e in at.exception],
+    }
+
+
+def report(script, password):
+    from interview_engine import DEFERRED_MODULES
+
+    print(f"Startup profile for {script}\n")
+
+    interpreter = top_level(importtime("pass"))
+    engine = importtime("import interview_engine")
+    login = {name: seconds for name, seconds in top_level(engine).items() if name not in interpreter}
+    deferred = top_level(importtime(f"import interview_engine; import {', '.join(DEFERRED_MODULES)}"))
+    login_total = sum(login.values())
+    deferred_total = sum(deferred.get(name, 0) for name in DEFERRED_MODULES)
+    print("Imports")
+    print(f"  before the login page   {login_total * 1000:8.1f} ms")
+    print(f"  deferred until login    {deferred_total * 1000:8.1f} ms  ({', '.join(DEFERRED_MODULES)})")
+    print("\n  slowest imports of interview_engine for the login page (cumulative)")
+    engine_imports = imported_by(engine, "interview_engine")
+    for name, seconds in sorted(engine_imports.items(), key=lambda item: -item[1])[:TOP_IMPORTS]:
+        print(f"    {seconds * 1000:8.1f} ms  {name}")
+
+    child = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--script", script, "--password", password, "--child"],
+        capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    times = json.loads(child.stdout.splitlines()[-1])
+    print("\nCold process")
+    print(f"  import streamlit        {times['streamlit_import'] * 1000:8.1f} ms")
+    print(f"  first render (login)    {times['login_page'] * 1000:8.1f} ms")
+    print(f"  login to first question {times['first_question'] * 1000:8.1f} ms")
+    for error in times["errors"]:
+        print(f"  ERROR: {error}")
+    return 1 if times["errors"] else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile the cold start of the interview app.")
+    parser.add_argument("--script", default="Session1.py", help="app script to profile")
+    parser.add_argument("--password", default=os.environ.get("INTERVIEW_PASSWORD", "Delta"), help="login password")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(render_times(args.script, args.password)))
+        return 0
+    return report(args.script, args.password)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
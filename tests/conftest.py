@@ -0,0 +1,19 @@
+import os
+import sys
+
+import pytest
+
+# The app's modules live at the top of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import session_manager  # noqa: E402
+import upload_spool  # noqa: E402
+
+
+@pytest.fixture
+def spool(tmp_path, monkeypatch):
+    """Points the spool at a temporary directory with no open recordings."""
+    for module in (upload_spool, session_manager):
+        monkeypatch.setattr(module, "SPOOL_DIR", str(tmp_path))
+    monkeypatch.setattr(upload_spool, "_recording_hashes", {})
+    return tmp_path
@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+import answer_store
+from answer_store import LocalAnswerStore, answer_key, parse_answer_key
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "answer.mp4"
+    path.write_bytes(bytes(range(256)) * 100)
+    return path
+
+
+def test_key_round_trip():
+    key = answer_key("jane-doe-1a2b3c4d", "session4", 9, ".mp4")
+    assert key == "jane-doe-1a2b3c4d/session4/q10.mp4"
+    assert parse_answer_key(key) == ("jane-doe-1a2b3c4d", "session4", 9)
+    assert parse_answer_key("not/a/key") is None
+
+
+def test_put_file_resumes_an_interrupted_copy(tmp_path, source):
+    store = LocalAnswerStore(str(tmp_path / "store"))
+    target = store.path_for("c/s/q01.mp4")
+    os.makedirs(os.path.dirname(target))
+    # The first half was written before the interruption; the rest must be appended
+    with open(target + ".part", "wb") as partial:
+        partial.write(source.read_bytes()[:12800])
+    store.put_file("c/s/q01.mp4", str(source))
+    assert open(target, "rb").read() == source.read_bytes()
+    assert not os.path.exists(target + ".part")
+
+
+def test_put_file_restarts_a_partial_copy_of_an_older_answer(tmp_path, source):
+    store = LocalAnswerStore(str(tmp_path / "store"))
+    target = store.path_for("c/s/q01.mp4")
+    os.makedirs(os.path.dirname(target))
+    with open(target + ".part", "wb") as partial:
+        partial.write(b"old answer")
+    os.utime(target + ".part", (0, 0))
+    store.put_file("c/s/q01.mp4", str(source))
+    assert open(target, "rb").read() == source.read_bytes()
+
+
+def test_list_and_delete(tmp_path, source):
+    store = LocalAnswerStore(str(tmp_path / "store"))
+    store.put_file("c/s/q01.mp4", str(source))
+    assert [key for key, _ in store.list_answers()] == ["c/s/q01.mp4"]
+    store.delete("c/s/q01.mp4")
+    store.delete("c/s/q01.mp4")
+    assert list(store.list_answers()) == []
+
+
+def test_background_write(tmp_path, source):
+    store = LocalAnswerStore(str(tmp_path / "store"))
+    stored = []
+    job_id = answer_store.submit_put(store, "c/s/q01.mp4", str(source), stored.append, owner="s")
+    assert answer_store.wait_for_put(job_id) == "c/s/q01.mp4"
+    assert answer_store.put_status(job_id) == "done"
+    assert stored == ["c/s/q01.mp4"]
+    assert store.exists("c/s/q01.mp4")
+    answer_store.forget_owner("s")
+    assert answer_store.put_status(job_id) is None
+
+
+def test_failed_background_write(tmp_path):
+    store = LocalAnswerStore(str(tmp_path / "store"))
+    job_id = answer_store.submit_put(store, "c/s/q01.mp4", str(tmp_path / "missing.mp4"), owner="s")
+    assert answer_store.wait_for_put(job_id) is None
+    assert answer_store.put_status(job_id) == "failed"
+    assert "Could not store c/s/q01.mp4" in answer_store.put_error(job_id)
+    answer_store.forget_owner("s")
@@ -0,0 +1,70 @@
+import auth
+from auth import TokenBucket, client_address
+
+
+class FakeSessionState(dict):
+    __getattr__ = dict.__getitem__
+    __setattr__ = dict.__setitem__
+
+
+class FakeContext:
+    def __init__(self, forwarded, ip_address):
+        self.headers = {"X-Forwarded-For": forwarded}
+        self.ip_address = ip_address
+
+
+class FakeStreamlit:
+    """A new browser session, as a script opening a fresh websocket would get."""
+
+    def __init__(self, forwarded, ip_address):
+        self.context = FakeContext(forwarded, ip_address)
+        self.session_state = FakeSessionState()
+
+
+def test_client_address_ignores_header_without_proxy():
+    assert client_address("198.51.100.7", "203.0.113.5", behind_proxy=False) == "203.0.113.5"
+
+
+def test_client_address_takes_the_entry_the_proxy_added():
+    assert client_address("198.51.100.7, 203.0.113.5", "127.0.0.1", behind_proxy=True) == "203.0.113.5"
+    assert client_address(None, "127.0.0.1", behind_proxy=True) == "127.0.0.1"
+
+
+def test_token_bucket_refills_over_time(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(auth.time, "monotonic", lambda: now[0])
+    bucket = TokenBucket(burst=2, refill_seconds=10)
+    assert bucket.take("a") and bucket.take("a")
+    assert not bucket.take("a")
+    assert bucket.take("b")
+    now[0] += 10
+    assert bucket.available("a") and bucket.take("a")
+    assert not bucket.take("a")
+
+
+def test_token_bucket_forgets_full_buckets(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(auth.time, "monotonic", lambda: now[0])
+    bucket = TokenBucket(burst=1, refill_seconds=1, max_keys=2)
+    bucket.take("a")
+    now[0] += 5
+    bucket.take("b")
+    bucket.take("c")
+    assert "a" not in bucket.buckets
+
+
+def test_spoofed_forwarded_header_does_not_refill_ip_bucket(monkeypatch):
+    monkeypatch.setattr(auth, "BEHIND_PROXY", True)
+    monkeypatch.setattr(auth, "session_limiter", TokenBucket(burst=100, refill_seconds=3600))
+    monkeypatch.setattr(auth, "ip_limiter", TokenBucket(burst=3, refill_seconds=3600))
+
+    def new_session(attempt):
+        # A fresh session each time, claiming a new address before the proxy's entry
+        monkeypatch.setattr(auth, "st", FakeStreamlit(f"10.0.0.{attempt}, 203.0.113.5", "127.0.0.1"))
+
+    for attempt in range(3):
+        new_session(attempt)
+        assert not auth.try_login("wrong", expected="secret")
+    new_session(3)
+    assert auth.login_blocked()
+    assert not auth.try_login("secret", expected="secret")
@@ -0,0 +1,95 @@
+import importlib.util
+import os
+import re
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import media_server
+
+DEPLOY_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deploy")
+
+spec = importlib.util.spec_from_file_location("launch", os.path.join(DEPLOY_DIR, "launch.py"))
+launch = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(launch)
+
+
+def free_ports(count):
+    """Returns the first of count consecutive free local ports."""
+    for first in range(20000, 30000, count):
+        sockets = []
+        try:
+            for port in range(first, first + count):
+                s = socket.socket()
+                sockets.append(s)
+                s.bind(("127.0.0.1", port))
+            return first
+        except OSError:
+            continue
+        finally:
+            for s in sockets:
+                s.close()
+    raise RuntimeError("no free ports")
+
+
+def test_workers_share_spool_progress_and_secret(monkeypatch):
+    monkeypatch.delenv("INTERVIEW_MEDIA_SECRET", raising=False)
+    monkeypatch.delenv("INTERVIEW_TRANSCODE_WORKERS", raising=False)
+    env = launch.worker_env(4)
+    assert env["INTERVIEW_SPOOL_DIR"] == launch.SPOOL_DIR
+    assert env["INTERVIEW_PROGRESS_DB"] == launch.PROGRESS_DB
+    assert len(env["INTERVIEW_MEDIA_SECRET"]) == 64
+    assert int(env["INTERVIEW_TRANSCODE_WORKERS"]) >= 1
+
+
+def test_nginx_routes_by_cookie_to_every_default_worker():
+    with open(os.path.join(DEPLOY_DIR, "nginx.conf"), encoding="utf-8") as f:
+        conf = f.read()
+    workers = conf.split("upstream interview_workers {", 1)[1].split("}", 1)[0]
+    assert "hash $interview_route consistent;" in workers
+    ports = [int(port) for port in re.findall(r"server 127\.0\.0\.1:(\d+);", workers)]
+    assert ports == list(range(launch.BASE_PORT, launch.BASE_PORT + len(ports)))
+    # A browser without the cookie gets one, so its next requests stick
+    assert "$cookie_interview_route" in conf and "Set-Cookie \"interview_route=$interview_route" in conf
+    # The login limits rely on nginx replacing, not extending, X-Forwarded-For
+    assert "proxy_set_header X-Forwarded-For $remote_addr;" in conf
+    assert f"server 127.0.0.1:{media_server.MEDIA_PORT};" in conf
+
+
+def test_check_reports_a_down_worker(capsys):
+    assert launch.check([free_ports(1)]) == 1
+    assert "DOWN" in capsys.readouterr().out
+
+
+def test_launch_starts_and_stops_healthy_workers(tmp_path):
+    script = tmp_path / "hello.py"
+    script.write_text("import streamlit as st\nst.write('hello')\n")
+    base_port = free_ports(3)
+    env = dict(
+        os.environ,
+        INTERVIEW_SPOOL_DIR=str(tmp_path / "spool"),
+        INTERVIEW_PROGRESS_DB=str(tmp_path / "progress.sqlite3"),
+        INTERVIEW_MEDIA_PORT=str(base_port + 2),
+    )
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(DEPLOY_DIR, "launch.py"), "--workers", "2",
+         "--base-port", str(base_port), "--script", str(script)],
+        env=env,
+    )
+    ports = [base_port, base_port + 1]
+    try:
+        deadline = time.time() + 90
+        while not all(launch.is_healthy(port, timeout=1) for port in ports):
+            assert process.poll() is None, "launcher exited"
+            assert time.time() < deadline, "workers did not become healthy"
+            time.sleep(0.5)
+        # The shared media server is up as well
+        with socket.create_connection(("127.0.0.1", base_port + 2), timeout=5):
+            pass
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=30)
+    assert process.returncode == 0
+    assert not any(launch.is_healthy(port, timeout=1) for port in ports)
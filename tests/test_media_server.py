@@ -0,0 +1,110 @@
+import os
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+from urllib.parse import quote
+
+import pytest
+
+import media_server
+from answer_store import LocalAnswerStore
+
+CONTENT = bytes(range(100))
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr(media_server, "SPOOL_DIR", str(tmp_path))
+    (tmp_path / "session").mkdir()
+    (tmp_path / "session" / "q01.mp4").write_bytes(CONTENT)
+    # Matches the version signed() puts in the URL
+    os.utime(tmp_path / "session" / "q01.mp4", ns=(1, 1))
+    store = LocalAnswerStore(str(tmp_path / "store"))
+    monkeypatch.setattr(media_server, "get_answer_store", lambda: store)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), media_server.MediaRequestHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def signed(base, relative_path, version="1", root="spool"):
+    relative_path = f"{root}/{relative_path}"
+    signature = media_server._signature(relative_path, version)
+    return f"{base}/media/{quote(relative_path)}?v={version}&sig={signature}"
+
+
+def fetch(url, range_header=None):
+    request = urllib.request.Request(url, headers={"Range": range_header} if range_header else {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, b""
+
+
+def test_whole_file(server):
+    status, headers, body = fetch(signed(server, "session/q01.mp4"))
+    assert status == 200
+    assert body == CONTENT
+    assert headers["Accept-Ranges"] == "bytes"
+
+
+@pytest.mark.parametrize("range_header, start, end", [
+    ("bytes=10-19", 10, 19),
+    ("bytes=90-", 90, 99),
+    ("bytes=-5", 95, 99),
+    ("bytes=95-1000", 95, 99),
+])
+def test_ranges(server, range_header, start, end):
+    status, headers, body = fetch(signed(server, "session/q01.mp4"), range_header)
+    assert status == 206
+    assert body == CONTENT[start:end + 1]
+    assert headers["Content-Range"] == f"bytes {start}-{end}/100"
+
+
+@pytest.mark.parametrize("range_header", ["bytes=-", "items=1-2", "bytes=200-", "bytes=20-10"])
+def test_unsatisfiable_ranges(server, range_header):
+    status, _, _ = fetch(signed(server, "session/q01.mp4"), range_header)
+    assert status == 416
+
+
+def test_bad_signature(server):
+    url = signed(server, "session/q01.mp4").replace("v=1", "v=2")
+    assert fetch(url)[0] == 403
+
+
+def test_replaced_file(server, tmp_path):
+    (tmp_path / "session" / "q01.mp4").write_bytes(b"new answer")
+    assert fetch(signed(server, "session/q01.mp4"))[0] == 410
+
+
+def test_outside_spool(server, tmp_path):
+    (tmp_path.parent / "secret.txt").write_text("secret")
+    assert fetch(signed(server, "../secret.txt"))[0] == 404
+
+
+def test_download_name(server):
+    url = signed(server, "session/q01.mp4") + "&download=Answer%201.mp4"
+    _, headers, _ = fetch(url)
+    assert headers["Content-Disposition"] == "attachment; filename*=UTF-8''Answer%201.mp4"
+
+
+def test_stored_answer(server, tmp_path):
+    stored = tmp_path / "store" / "jane" / "session1" / "q01.mp4"
+    stored.parent.mkdir(parents=True)
+    stored.write_bytes(CONTENT)
+    os.utime(stored, ns=(1, 1))
+    status, _, body = fetch(signed(server, "jane/session1/q01.mp4", root="store"))
+    assert (status, body) == (200, CONTENT)
+    assert fetch(signed(server, "session/q01.mp4", root="elsewhere"))[0] == 404
+
+
+def test_media_url_names_the_root(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(media_server, "MEDIA_BASE_URL", "http://media.example")
+    monkeypatch.setattr(media_server, "MEDIA_EMBEDDED", False)
+    url = media_server.media_url(str(tmp_path / "session" / "q01.mp4"))
+    assert url == signed("http://media.example", "session/q01.mp4")
+    with pytest.raises(ValueError):
+        media_server.media_url(__file__)
@@ -0,0 +1,25 @@
+import json
+import socket
+
+import metrics
+
+
+def test_counting_goes_on_when_the_port_is_taken(tmp_path, monkeypatch, capsys):
+    taken = socket.socket()
+    taken.bind(("127.0.0.1", 0))
+    taken.listen()
+    log = tmp_path / "metrics.jsonl"
+    monkeypatch.setattr(metrics, "METRICS_PORT", taken.getsockname()[1])
+    monkeypatch.setattr(metrics, "METRICS_LOG", str(log))
+    monkeypatch.setattr(metrics, "_server", None)
+    monkeypatch.setattr(metrics, "_server_failed", False)
+    monkeypatch.setattr(metrics, "_counters", {})
+    try:
+        metrics.count("interview_reruns_total", scope="page")
+        metrics.count("interview_reruns_total", scope="page")
+    finally:
+        taken.close()
+    assert metrics._server is None
+    assert capsys.readouterr().err.count("Metrics endpoint not started") == 1
+    assert 'interview_reruns_total{scope="page"} 2' in metrics.render()
+    assert [json.loads(line)["counter"] for line in log.read_text().splitlines()] == ["interview_reruns_total"] * 2
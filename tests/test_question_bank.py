@@ -0,0 +1,25 @@
+from collections import Counter
+
+from question_bank import MIXED_SESSION, interview_plan, list_sessions, load_questions, mixed_quotas
+
+
+def test_a_bank_is_asked_in_full_and_in_order():
+    session = list_sessions()[0]
+    plan = interview_plan(session, 1)
+    assert [question.text for question in plan] == list(load_questions(session))
+    assert [question.index for question in plan] == list(range(len(plan)))
+
+
+def test_mixed_plan_depends_only_on_the_seed():
+    assert interview_plan.__wrapped__(MIXED_SESSION, 42) == interview_plan.__wrapped__(MIXED_SESSION, 42)
+    assert interview_plan(MIXED_SESSION, 42) != interview_plan(MIXED_SESSION, 43)
+
+
+def test_mixed_plan_follows_the_quotas():
+    plan = interview_plan(MIXED_SESSION, 7)
+    per_bank = Counter(question.session for question in plan)
+    for session, quota in mixed_quotas():
+        assert per_bank[session] == min(quota, len(load_questions(session)))
+    assert len(set(plan)) == len(plan)
+    for question in plan:
+        assert load_questions(question.session)[question.index] == question.text
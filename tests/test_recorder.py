@@ -0,0 +1,47 @@
+import base64
+import os
+from types import SimpleNamespace
+
+import pytest
+
+import recorder
+from session_manager import AnswerState
+
+
+@pytest.fixture
+def session_state(spool, monkeypatch):
+    state = {}
+    monkeypatch.setattr(recorder, "st", SimpleNamespace(session_state=state))
+    return state
+
+
+def chunk(recording_id, seq, data=b"", final=False):
+    return {"rec": recording_id, "seq": seq, "data": base64.b64encode(data).decode(), "final": final, "mime": "video/mp4"}
+
+
+def test_recorder_message_does_not_take_over_an_upload(session_state):
+    answer = AnswerState()
+    session_state["uploader"] = chunk("aaaa1111", 0, b"up-0 ")
+    recorder._receive("uploader", "s", 0, answer, "upload", ["mp4"])
+    # A leftover first chunk from the recorder of the same question
+    session_state["recorder"] = chunk("bbbb2222", 0, b"rec-0 ")
+    recorder._receive("recorder", "s", 0, answer, "recording")
+
+    session_state["uploader"] = chunk("aaaa1111", 1, b"up-1")
+    progress, _ = recorder._receive("uploader", "s", 0, answer, "upload", ["mp4"])
+    assert progress["next_seq"] == 2
+    assert recorder.receiving(answer)
+
+    session_state["uploader"] = chunk("aaaa1111", 2, final=True)
+    _, path = recorder._receive("uploader", "s", 0, answer, "upload", ["mp4"])
+    assert open(path, "rb").read() == b"up-0 up-1"
+    assert os.path.basename(path) == "q01.mp4"
+
+
+def test_resent_chunks_are_skipped(session_state):
+    answer = AnswerState()
+    for seq in (0, 0, 1, 1):
+        session_state["recorder"] = chunk("cccc3333", seq, f"c{seq}".encode())
+        progress, _ = recorder._receive("recorder", "s", 0, answer, "recording")
+    assert progress["next_seq"] == 2
+    assert recorder._ack_args(progress) == {"ack_rec": "cccc3333", "ack_seq": 1, "error": None}
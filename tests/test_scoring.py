@@ -0,0 +1,33 @@
+from scoring import WEIGHTS, answer_hash, score_answer
+
+QUESTION = "Why did you choose this university?"
+RUBRIC = {"keywords": [["ranking", "ranked"], ["course", "programme"]], "min_words": 5, "max_words": 40}
+
+
+def test_empty_answer_scores_zero():
+    assert score_answer(QUESTION, RUBRIC, "")[0] == 0
+
+
+def test_a_complete_answer_gets_full_marks():
+    text = "I did choose this university because its course is ranked highly and the programme suits me"
+    score, details = score_answer(QUESTION, RUBRIC, text)
+    assert details["missing"] == []
+    assert score == sum(WEIGHTS.values())
+
+
+def test_missing_points_and_fillers_cost_marks():
+    text = "um I chose this university uh because um the ranking"
+    score, details = score_answer(QUESTION, RUBRIC, text)
+    assert details["missing"] == ["course"]
+    assert details["coverage"] == 0.5
+    assert details["fluency"] < 1
+    assert score < sum(WEIGHTS.values())
+
+
+def test_length_limits():
+    assert score_answer(QUESTION, RUBRIC, "university")[1]["length"] == 0.2
+    assert score_answer(QUESTION, RUBRIC, "university " * 60)[1]["length"] == 0.5
+
+
+def test_hash_changes_with_the_rubric():
+    assert answer_hash(QUESTION, RUBRIC, "text") != answer_hash(QUESTION, None, "text")
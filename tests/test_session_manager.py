@@ -0,0 +1,45 @@
+import os
+import threading
+
+import pytest
+
+import progress_store
+import session_manager
+import upload_spool
+
+
+@pytest.fixture(autouse=True)
+def progress_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(progress_store, "PROGRESS_DB", str(tmp_path / "progress.sqlite3"))
+    monkeypatch.setattr(progress_store, "_local", threading.local())
+
+
+def idle(spool_dir):
+    marker = os.path.join(spool_dir, session_manager.LAST_SEEN_FILE)
+    open(marker, "a").close()
+    os.utime(marker, (0, 0))
+
+
+def test_sweep_drops_idle_sessions_and_their_recording_hashes(spool):
+    upload_spool.append_recording_chunk("abandoned", 0, "abcdef12", b"data")
+    idle(spool / "abandoned")
+    assert session_manager.sweep_idle_sessions(ttl=60) == 1
+    assert not (spool / "abandoned").exists()
+    assert not upload_spool._recording_hashes
+
+
+def test_sweep_keeps_active_sessions(spool):
+    upload_spool.session_spool_dir("active")
+    os.utime(spool / "active", None)
+    assert session_manager.sweep_idle_sessions(ttl=60) == 0
+    assert (spool / "active").exists()
+
+
+def test_sweep_forgets_the_saved_progress_of_idle_sessions(spool):
+    for spool_id in ("idle", "active"):
+        upload_spool.session_spool_dir(spool_id)
+        progress_store.save(spool_id, {"progress": {"spool_id": spool_id}})
+    idle(spool / "idle")
+    assert session_manager.sweep_idle_sessions(ttl=60) == 1
+    assert progress_store.load("idle") is None
+    assert progress_store.load("active") is not None
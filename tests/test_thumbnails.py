@@ -0,0 +1,69 @@
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import thumbnails
+import upload_spool
+
+
+def fake_tool(tmp_path, name, body):
+    path = tmp_path / name
+    path.write_text(f"#!/bin/sh\necho run >> {tmp_path / (name + '.runs')}\n{body}\n")
+    path.chmod(0o755)
+    return str(path)
+
+
+def runs(tmp_path, name):
+    log = tmp_path / (name + ".runs")
+    return len(log.read_text().splitlines()) if log.exists() else 0
+
+
+@pytest.fixture
+def answer(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_spool, "SPOOL_DIR", str(tmp_path / "spool"))
+    monkeypatch.setattr(thumbnails, "FFPROBE", fake_tool(tmp_path, "ffprobe", "echo 12.0"))
+    path = os.path.join(upload_spool.session_spool_dir("s"), "q01.mp4")
+    with open(path, "wb") as f:
+        f.write(b"video")
+    return path
+
+
+def wait_until_done(path):
+    deadline = time.time() + 10
+    while thumbnails.is_pending(path):
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+
+def test_images_are_made_once_next_to_the_answer(tmp_path, answer, monkeypatch):
+    # Writes an empty image to the output path, the last argument
+    monkeypatch.setattr(thumbnails, "FFMPEG", fake_tool(tmp_path, "ffmpeg", 'for last; do :; done; touch "$last"'))
+    assert thumbnails.for_file(answer) is None
+    wait_until_done(answer)
+    poster, strip = thumbnails.for_file(answer)
+    assert os.path.dirname(poster) == os.path.dirname(answer)
+    assert os.path.basename(poster).startswith("q01.") and os.path.exists(strip)
+    thumbnails.for_file(answer)
+    assert runs(tmp_path, "ffmpeg") == 2  # poster and strip, once
+
+    upload_spool.clear_session_spool("s")
+    assert not os.path.exists(poster)
+
+
+def test_a_failed_answer_is_not_tried_again(tmp_path, answer, monkeypatch):
+    monkeypatch.setattr(thumbnails, "FFMPEG", fake_tool(tmp_path, "ffmpeg", "exit 1"))
+    for _ in range(5):
+        assert thumbnails.for_file(answer) is None
+        wait_until_done(answer)
+    assert runs(tmp_path, "ffmpeg") == 1
+    assert not thumbnails.is_pending(answer)
+
+
+def test_audio_answers_have_no_pictures(monkeypatch):
+    banks = {"talk": "audio", "film": "video"}
+    monkeypatch.setattr(thumbnails, "load_bank", lambda session: SimpleNamespace(answer_mode=banks[session]))
+    assert thumbnails.is_audio_answer("jane/talk/q01.webm")
+    assert not thumbnails.is_audio_answer("jane/film/q01.webm")
+    assert thumbnails.is_audio_answer("jane/film/q01.m4a")
@@ -0,0 +1,17 @@
+import scoring
+import transcribe
+
+
+def test_answers_that_left_the_store_are_forgotten(tmp_path, monkeypatch):
+    monkeypatch.setattr(scoring, "SCORES_DB", str(tmp_path / "scores.sqlite3"))
+    connection = transcribe.connect(str(tmp_path / "transcripts.sqlite3"))
+    scores = scoring.connect(str(tmp_path / "scores.sqlite3"))
+    for key in ("c/session1/q01.mp4", "c/session1/q02.mp4"):
+        transcribe.save_transcript(connection, key, "1-1", "my answer")
+        with scores:
+            scores.execute("INSERT INTO scores (key, answer_hash) VALUES (?, ?)", (key, "hash"))
+
+    assert transcribe.forget_removed(connection, ["c/session1/q02.mp4"]) == 1
+    assert list(transcribe.indexed_versions(connection)) == ["c/session1/q02.mp4"]
+    assert [key for (key,) in scores.execute("SELECT key FROM scores")] == ["c/session1/q02.mp4"]
+    assert transcribe.forget_removed(connection, ["c/session1/q02.mp4"]) == 0
@@ -0,0 +1,83 @@
+import os
+import uuid
+
+import pytest
+
+import upload_spool
+from upload_spool import DuplicateAnswer, SpoolQuotaExceeded
+
+
+def spool_answer(spool_id, q_index, data, extension=".mp4"):
+    """Receives data as one recording and makes it the answer to a question."""
+    recording_id = uuid.uuid4().hex[:8]
+    upload_spool.append_recording_chunk(spool_id, q_index, recording_id, data)
+    return upload_spool.finish_recording(spool_id, q_index, recording_id, extension)
+
+
+def test_replacing_an_answer_removes_the_old_file(spool):
+    first = spool_answer("s", 0, b"first", ".mp4")
+    second = spool_answer("s", 0, b"second", ".mov")
+    assert not os.path.exists(first)
+    assert open(second, "rb").read() == b"second"
+    index = upload_spool._read_content_index(str(spool / "s"))
+    assert sorted(index.values()) == ["q01.mov"]
+
+
+def test_same_content_for_another_question_is_a_duplicate(spool):
+    first = spool_answer("s", 0, b"answer")
+    with pytest.raises(DuplicateAnswer) as raised:
+        spool_answer("s", 1, b"answer")
+    assert raised.value.path == first
+    assert sorted(os.listdir(spool / "s")) == [upload_spool.CONTENT_INDEX_FILE, "q01.mp4"]
+
+
+def test_index_entry_of_a_deleted_file_is_ignored(spool):
+    first = spool_answer("s", 0, b"answer")
+    os.remove(first)
+    assert spool_answer("s", 1, b"answer").endswith("q02.mp4")
+
+
+def test_recording_is_hashed_as_it_arrives(spool):
+    upload_spool.append_recording_chunk("s", 0, "abcdef12", b"one ")
+    upload_spool.append_recording_chunk("s", 0, "abcdef12", b"two")
+    path = upload_spool.finish_recording("s", 0, "abcdef12", ".webm")
+    assert open(path, "rb").read() == b"one two"
+    index = upload_spool._read_content_index(str(spool / "s"))
+    assert index == {upload_spool._file_digest(path): "q01.webm"}
+    assert not upload_spool._recording_hashes
+
+
+def test_recording_hashed_elsewhere_is_read_again(spool):
+    upload_spool.append_recording_chunk("s", 0, "abcdef12", b"one ")
+    # Chunks received by another app process are not in this one's hash
+    upload_spool._recording_hashes.clear()
+    upload_spool.append_recording_chunk("s", 0, "abcdef12", b"two")
+    path = upload_spool.finish_recording("s", 0, "abcdef12", ".webm")
+    index = upload_spool._read_content_index(str(spool / "s"))
+    assert index == {upload_spool._file_digest(path): "q01.webm"}
+
+
+def test_quota(spool, monkeypatch):
+    monkeypatch.setattr(upload_spool, "MAX_SESSION_BYTES", 10)
+    spool_answer("s", 0, b"x" * 6)
+    with pytest.raises(SpoolQuotaExceeded):
+        spool_answer("s", 1, b"y" * 6)
+    assert sorted(os.listdir(spool / "s")) == [upload_spool.CONTENT_INDEX_FILE, "q01.mp4"]
+
+
+def test_preview_images_do_not_count_against_the_quota(spool, monkeypatch):
+    monkeypatch.setattr(upload_spool, "MAX_SESSION_BYTES", 10)
+    path = spool_answer("s", 0, b"x" * 6)
+    base = os.path.splitext(path)[0] + ".0123abcd"
+    for suffix in ("-poster.jpg", "-strip.jpg", "-strip.jpg.part", ".failed"):
+        with open(base + suffix, "wb") as f:
+            f.write(b"i" * 100)
+    assert upload_spool.session_spool_bytes("s") == 6
+    assert spool_answer("s", 1, b"y" * 4).endswith("q02.mp4")
+
+
+def test_clear_session_spool_forgets_recordings(spool):
+    upload_spool.append_recording_chunk("s", 0, "abcdef12", b"data")
+    upload_spool.clear_session_spool("s")
+    assert not (spool / "s").exists()
+    assert not upload_spool._recording_hashes
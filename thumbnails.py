@@ -0,0 +1,263 @@
+"""Poster frames and preview strips for answer videos.
+
+Each answer gets two small JPEGs, made with ffmpeg in a background thread:
+a poster (one representative frame) and a strip of a few low-resolution
+frames spread over the whole answer. Pages show these instead of loading
+the video, and only draw the player when asked to.
+
+Images are cached under a name derived from the answer's identity (path,
+size and modification time for spooled files; key and version for stored
+answers), so a replaced answer gets new images and nothing is made twice.
+A file ffmpeg cannot read gets a failure marker instead, and is not tried
+again. Images of spooled answers are kept in the session's spool
+directory, so they are deleted with it; those of stored answers go to
+INTERVIEW_THUMBNAIL_DIR. To make them for every stored answer ahead of
+time:
+
+    python thumbnails.py
+"""
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import nullcontext
+
+from answer_store import parse_answer_key
+from question_bank import load_bank
+from transcode import FFMPEG
+
+# --- CONFIGURATION ---
+THUMBNAIL_DIR = os.environ.get(
+    "INTERVIEW_THUMBNAIL_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "thumbnails"),
+)
+FFPROBE = os.environ.get("INTERVIEW_FFPROBE", "ffprobe")
+THUMBNAILS_ENABLED = os.environ.get("INTERVIEW_THUMBNAILS", "1") != "0"
+THUMBNAIL_WORKERS = int(os.environ.get("INTERVIEW_THUMBNAIL_WORKERS", 1))
+
+POSTER_HEIGHT = 240
+STRIP_HEIGHT = 72
+STRIP_FRAMES = 6
+
+# Answers without pictures. A .webm answer may be either; see is_audio_answer()
+AUDIO_EXTENSIONS = (".m4a", ".mp3", ".ogg", ".opus", ".wav", ".aac")
+
+_executor = None
+_pending = {}  # identity -> future
+_lock = threading.Lock()
+
+
+def thumbnails_available():
+    """True when images can be made (enabled, and ffmpeg and ffprobe on the PATH)."""
+    return THUMBNAILS_ENABLED and shutil.which(FFMPEG) is not None and shutil.which(FFPROBE) is not None
+
+
+def is_audio_answer(key):
+    """True for a stored answer without pictures.
+
+    Audio-only banks record .webm in Chrome, like video answers, so the
+    bank's answer mode decides rather than the extension alone.
+    """
+    if key.endswith(AUDIO_EXTENSIONS):
+        return True
+    parsed = parse_answer_key(key)
+    if parsed is None:
+        return False
+    try:
+        return load_bank(parsed[1]).answer_mode == "audio"
+    except FileNotFoundError:
+        return False  # The bank has been removed since
+
+
+def file_identity(path):
+    stat = os.stat(path)
+    return f"file|{os.path.realpath(path)}|{stat.st_size}|{stat.st_mtime_ns}"
+
+
+def stored_identity(key, version):
+    return f"store|{key}|{version}"
+
+
+def cache_base(identity, folder=None, prefix=""):
+    """Returns the path, without suffix, the images of an answer are cached under."""
+    digest = hashlib.sha256(identity.encode("utf-8")).hexdigest()[:32]
+    return os.path.join(folder or THUMBNAIL_DIR, f"{prefix}{digest}")
+
+
+def file_cache_base(path):
+    """Images of a spooled answer sit next to it, named after it (qNN.<digest>-...).
+
+    An answer replaced in the spool takes its images along, and clearing
+    the session's spool removes them.
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return cache_base(file_identity(path), os.path.dirname(path), f"{stem}.")
+
+
+def image_paths(base):
+    """Returns where the (poster, strip) of an answer are, or would be, cached."""
+    return f"{base}-poster.jpg", f"{base}-strip.jpg"
+
+
+def has_failed(base):
+    return os.path.exists(f"{base}.failed")
+
+
+def cached_images(base):
+    """Returns (poster, strip) if they have been made, else None."""
+    poster, strip = image_paths(base)
+    if not os.path.exists(poster):
+        return None
+    return poster, strip if os.path.exists(strip) else None
+
+
+def _render(command, output_path):
+    """Runs ffmpeg into a temporary name so half-written images are never shown."""
+    partial = output_path + ".part"
+    try:
+        subprocess.run(command + ["-f", "image2", "-update", "1", partial], check=True, capture_output=True)
+        os.replace(partial, output_path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+
+
+def video_duration(path):
+    """Returns the length of a video in seconds, or None if unknown."""
+    result = subprocess.run(
+        [FFPROBE, "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+        capture_output=True, text=True,
+    )
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        return None
+
+
+def make_images(source_path, base):
+    """Makes the poster and the strip of one answer.
+
+    If ffmpeg fails, a failure marker is left so the answer is not tried again.
+    """
+    try:
+        return _make_images(source_path, base)
+    except (OSError, subprocess.CalledProcessError):
+        open(f"{base}.failed", "w").close()
+        raise
+
+
+def _make_images(source_path, base):
+    poster, strip = image_paths(base)
+    os.makedirs(os.path.dirname(base), exist_ok=True)
+    base = [FFMPEG, "-nostdin", "-hide_banner", "-loglevel", "error", "-y", "-i", source_path, "-an"]
+    # The thumbnail filter picks a representative frame, skipping black or blurred ones
+    _render(base + ["-vf", f"thumbnail,scale=-2:{POSTER_HEIGHT}", "-frames:v", "1", "-q:v", "4"], poster)
+    duration = video_duration(source_path)
+    if duration:
+        fps = STRIP_FRAMES / duration
+        _render(
+            base + ["-vf", f"fps={fps:.6f},scale=-2:{STRIP_HEIGHT},tile={STRIP_FRAMES}x1", "-frames:v", "1", "-q:v", "6"],
+            strip,
+        )
+    return poster, strip
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=THUMBNAIL_WORKERS, thread_name_prefix="thumbnail")
+    return _executor
+
+
+def _request(base, open_source):
+    """Returns the cached images, or queues them and returns None.
+
+    Nothing is queued for an answer that failed before. open_source()
+    must return a context manager giving a local path.
+    """
+    images = cached_images(base)
+    if images is not None or has_failed(base) or not thumbnails_available():
+        return images
+
+    def run():
+        try:
+            with open_source() as path:
+                return make_images(path, base)
+        finally:
+            with _lock:
+                _pending.pop(base, None)
+
+    executor = _get_executor()
+    with _lock:
+        # run() removes the entry under the same lock, so only after it is set
+        if base not in _pending:
+            _pending[base] = executor.submit(run)
+    return None
+
+
+def for_file(path):
+    """Images for a spooled answer file: (poster, strip), or None if there are none (yet)."""
+    if path.endswith(AUDIO_EXTENSIONS):
+        return None
+    return _request(file_cache_base(path), lambda: nullcontext(path))
+
+
+def for_stored(store, key, version):
+    """Images for an answer in the answer store, fetched in the background if needed."""
+    if is_audio_answer(key):
+        return None
+    return _request(cache_base(stored_identity(key, version)), lambda: store.local_copy(key))
+
+
+def _is_queued(base):
+    with _lock:
+        return base in _pending
+
+
+def is_pending(path):
+    """True while the images of a spooled answer file are being made."""
+    return _is_queued(file_cache_base(path))
+
+
+def is_stored_pending(key, version):
+    """True while the images of a stored answer are being made."""
+    return _is_queued(cache_base(stored_identity(key, version)))
+
+
+def build_all():
+    """Makes the images of every stored answer that has none yet."""
+    from answer_store import get_answer_store
+
+    store = get_answer_store()
+    if store is None:
+        raise SystemExit("Set INTERVIEW_ANSWER_STORE to the answer store to make thumbnails for.")
+    if not thumbnails_available():
+        raise SystemExit(f"{FFMPEG} and {FFPROBE} are needed to make thumbnails.")
+    pending = [
+        (key, version) for key, version in store.list_answers()
+        if not is_audio_answer(key) and cached_images(cache_base(stored_identity(key, version))) is None
+    ]
+    print(f"{len(pending)} answers without thumbnails")
+    executor = _get_executor()
+    futures = {}
+    for key, version in pending:
+        futures[executor.submit(_make_stored, store, key, cache_base(stored_identity(key, version)))] = key
+    wait(futures)
+    failed = [key for future, key in futures.items() if future.exception() is not None]
+    for key in failed:
+        print(f"FAILED {key}", file=sys.stderr)
+    print(f"{len(futures) - len(failed)} made, cache at {THUMBNAIL_DIR}")
+    return 1 if failed else 0
+
+
+def _make_stored(store, key, base):
+    with store.local_copy(key) as path:
+        return make_images(path, base)
+
+
+if __name__ == "__main__":
+    sys.exit(build_all())
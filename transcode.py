@@ -0,0 +1,162 @@
+"""Background compression of answer videos.
+
+Phone uploads arrive at full camera bitrate in whatever container the
+phone uses. When ffmpeg is installed, each spooled answer is queued for a
+worker pool that re-encodes it to a bounded-bitrate H.264/AAC mp4 next to
+the original (qNN.<job>.web.mp4), or, for audio-only answers, to a small
+AAC file (qNN.<job>.web.m4a). The request path only submits the job; the
+app keeps using the original until the compressed copy is ready.
+"""
+import os
+import shutil
+import subprocess
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# --- CONFIGURATION ---
+FFMPEG = os.environ.get("INTERVIEW_FFMPEG", "ffmpeg")
+TRANSCODE_WORKERS = int(os.environ.get("INTERVIEW_TRANSCODE_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+TRANSCODE_ENABLED = os.environ.get("INTERVIEW_TRANSCODE", "1") != "0"
+
+# Output limits: at most 720p, about 1.5 Mbit/s video and 96 kbit/s audio
+MAX_HEIGHT = 720
+VIDEO_MAXRATE = "1500k"
+AUDIO_BITRATE = "96k"
+# Audio-only answers: speech-quality mono AAC, about 350 KB per minute
+SPEECH_BITRATE = "48k"
+
+# Suffix of compressed copies inside the spool
+COMPRESSED_SUFFIX = ".web.mp4"
+AUDIO_COMPRESSED_SUFFIX = ".web.m4a"
+
+_executor = None
+_jobs = {}
+_owners = {}
+_lock = threading.Lock()
+
+
+def transcode_available():
+    """True when jobs can be run (enabled and ffmpeg on the PATH)."""
+    return TRANSCODE_ENABLED and shutil.which(FFMPEG) is not None
+
+
+def compressed_path(source_path, job_id, audio_only=False):
+    """Returns where a job writes the compressed copy of an answer."""
+    suffix = AUDIO_COMPRESSED_SUFFIX if audio_only else COMPRESSED_SUFFIX
+    return f"{os.path.splitext(source_path)[0]}.{job_id[:8]}{suffix}"
+
+
+def ffmpeg_command(source_path, output_path, audio_only=False):
+    """Builds the ffmpeg command for one answer."""
+    if audio_only:
+        return [
+            FFMPEG, "-nostdin", "-hide_banner", "-loglevel", "error", "-y",
+            "-i", source_path,
+            "-vn", "-ac", "1",
+            "-c:a", "aac", "-b:a", SPEECH_BITRATE,
+            "-movflags", "+faststart",
+            "-f", "mp4",
+            output_path,
+        ]
+    return [
+        FFMPEG, "-nostdin", "-hide_banner", "-loglevel", "error", "-y",
+        "-i", source_path,
+        "-c:v", "libx264", "-preset", "veryfast", "-crf", "28",
+        "-maxrate", VIDEO_MAXRATE, "-bufsize", "3000k",
+        "-vf", f"scale=-2:'min({MAX_HEIGHT},ih)'",
+        "-pix_fmt", "yuv420p",
+        "-c:a", "aac", "-b:a", AUDIO_BITRATE,
+        "-movflags", "+faststart",
+        "-f", "mp4",
+        output_path,
+    ]
+
+
+def transcode_file(source_path, output_path, audio_only=False):
+    """Runs ffmpeg, writing to a temporary name so half-done files are never used."""
+    partial = output_path + ".part"
+    try:
+        subprocess.run(ffmpeg_command(source_path, partial, audio_only), check=True, capture_output=True)
+        os.replace(partial, output_path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    return output_path
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=TRANSCODE_WORKERS, thread_name_prefix="transcode")
+    return _executor
+
+
+def submit(source_path, on_done=None, owner=None, audio_only=False):
+    """Queues an answer for compression and returns the job id.
+
+    on_done(output_path) is called from the worker thread once the
+    compressed copy exists. owner tags the job (e.g. with the session's
+    spool id) so forget_owner() can drop all of a session's jobs at once.
+    With audio_only the answer is reduced to a speech-quality AAC file.
+    """
+    job_id = uuid.uuid4().hex
+    output_path = compressed_path(source_path, job_id, audio_only)
+    source_mtime = os.stat(source_path).st_mtime_ns
+
+    def run():
+        transcode_file(source_path, output_path, audio_only)
+        # The candidate replaced the answer while it was being compressed
+        if not os.path.exists(source_path) or os.stat(source_path).st_mtime_ns != source_mtime:
+            os.remove(output_path)
+            raise RuntimeError("answer was replaced during compression")
+        if on_done is not None:
+            on_done(output_path)
+        return output_path
+
+    future = _get_executor().submit(run)
+    with _lock:
+        _jobs[job_id] = future
+        _owners[job_id] = owner
+    return job_id
+
+
+def job_status(job_id):
+    """Returns 'queued', 'running', 'done', 'failed' or None for unknown jobs."""
+    with _lock:
+        future = _jobs.get(job_id)
+    if future is None:
+        return None
+    if future.running():
+        return "running"
+    if not future.done():
+        return "queued"
+    return "failed" if future.exception() is not None else "done"
+
+
+def job_output(job_id):
+    """Returns the compressed file of a finished job, or None."""
+    if job_status(job_id) != "done":
+        return None
+    with _lock:
+        future = _jobs[job_id]
+    path = future.result()
+    return path if os.path.exists(path) else None
+
+
+def forget(job_id):
+    """Drops a job from the registry, cancelling it if it has not started."""
+    with _lock:
+        future = _jobs.pop(job_id, None)
+        _owners.pop(job_id, None)
+    if future is not None:
+        future.cancel()
+
+
+def forget_owner(owner):
+    """Drops every job submitted for one owner."""
+    with _lock:
+        job_ids = [job_id for job_id, job_owner in _owners.items() if job_owner == owner]
+    for job_id in job_ids:
+        forget(job_id)
@@ -0,0 +1,195 @@
+"""Offline speech-to-text for stored answers.
+
+Transcribes every answer in the answer store (see answer_store.py) with a
+CPU-only Vosk model, in a pool of worker processes, and indexes the text
+by candidate, session and question in a SQLite full-text index. Answers
+already transcribed at their current version are skipped, and those no
+longer in the store are dropped from the index and from the scores.
+
+    pip install vosk        # and download a model, e.g. vosk-model-en-us-0.22
+    python transcribe.py --model /models/vosk-model-en-us-0.22 --workers 4
+    python transcribe.py --search "tuition fee"
+
+Audio is pulled out of each video with ffmpeg as 16 kHz mono PCM and fed
+to the recogniser as a stream, so no temporary audio files are written.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from answer_store import get_answer_store, parse_answer_key
+from question_bank import list_sessions, load_questions
+
+# --- CONFIGURATION ---
+TRANSCRIPTS_DB = os.environ.get(
+    "INTERVIEW_TRANSCRIPTS_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "transcripts.sqlite3"),
+)
+FFMPEG = os.environ.get("INTERVIEW_FFMPEG", "ffmpeg")
+SAMPLE_RATE = 16000
+# Bytes of PCM handed to the recogniser at a time (0.25 s)
+PCM_CHUNK_SIZE = SAMPLE_RATE // 4 * 2
+
+_model = None
+
+
+def connect(path=TRANSCRIPTS_DB):
+    """Opens the transcript index, creating it on first use."""
+    connection = sqlite3.connect(path, timeout=10)
+    connection.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS transcripts USING fts5("
+        " key UNINDEXED, candidate UNINDEXED, session UNINDEXED, question_index UNINDEXED,"
+        " question, text, version UNINDEXED)"
+    )
+    return connection
+
+
+def indexed_versions(connection):
+    """Returns {key: version} of everything already transcribed."""
+    return dict(connection.execute("SELECT key, version FROM transcripts"))
+
+
+def save_transcript(connection, key, version, text):
+    candidate, session, q_index = parse_answer_key(key)
+    questions = load_questions(session) if session in list_sessions() else ()
+    question = questions[q_index] if q_index < len(questions) else ""
+    with connection:
+        connection.execute("DELETE FROM transcripts WHERE key = ?", (key,))
+        connection.execute(
+            "INSERT INTO transcripts (key, candidate, session, question_index, question, text, version)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, candidate, session, q_index, question, text, version),
+        )
+
+
+def forget_removed(connection, stored_keys):
+    """Deletes the transcripts and scores of answers that left the store.
+
+    Returns how many answers were forgotten.
+    """
+    removed = set(indexed_versions(connection)) - set(stored_keys)
+    if not removed:
+        return 0
+    with connection:
+        connection.executemany("DELETE FROM transcripts WHERE key = ?", [(key,) for key in removed])
+    # scoring imports this module, so it is only imported when needed
+    import scoring
+
+    if os.path.exists(scoring.SCORES_DB):
+        scoring.forget_scores(removed, scoring.connect(scoring.SCORES_DB))
+    return len(removed)
+
+
+def get_transcript(key, connection=None):
+    """Returns the transcript of one stored answer, or None."""
+    connection = connection or connect()
+    row = connection.execute("SELECT text FROM transcripts WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def search(query, limit=20, connection=None):
+    """Full-text search over transcripts and question texts.
+
+    Returns (key, candidate, session, question_index, snippet) rows, best
+    match first.
+    """
+    connection = connection or connect()
+    return connection.execute(
+        "SELECT key, candidate, session, question_index,"
+        " snippet(transcripts, 5, '[', ']', '...', 12)"
+        " FROM transcripts WHERE transcripts MATCH ? ORDER BY rank LIMIT ?",
+        (query, limit),
+    ).fetchall()
+
+
+# --- WORKER PROCESSES ---
+def _load_model(model_path):
+    """Loads the Vosk model once per worker process."""
+    global _model
+    from vosk import Model, SetLogLevel
+
+    SetLogLevel(-1)
+    _model = Model(model_path)
+
+
+def transcribe_file(path):
+    """Transcribes one video or audio file with the worker's model."""
+    from vosk import KaldiRecognizer
+
+    recogniser = KaldiRecognizer(_model, SAMPLE_RATE)
+    ffmpeg = subprocess.Popen(
+        [FFMPEG, "-nostdin", "-loglevel", "error", "-i", path,
+         "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "s16le", "-"],
+        stdout=subprocess.PIPE,
+    )
+    parts = []
+    while True:
+        data = ffmpeg.stdout.read(PCM_CHUNK_SIZE)
+        if not data:
+            break
+        if recogniser.AcceptWaveform(data):
+            parts.append(json.loads(recogniser.Result())["text"])
+    parts.append(json.loads(recogniser.FinalResult())["text"])
+    if ffmpeg.wait() != 0:
+        raise RuntimeError(f"ffmpeg could not read {path}")
+    return " ".join(part for part in parts if part)
+
+
+def transcribe_answer(key):
+    """Worker entry point: fetches a stored answer and transcribes it."""
+    with get_answer_store().local_copy(key) as path:
+        return transcribe_file(path)
+
+
+# --- BATCH RUN ---
+def transcribe_all(model_path, workers):
+    """Transcribes every new or changed answer in the store."""
+    store = get_answer_store()
+    if store is None:
+        raise SystemExit("Set INTERVIEW_ANSWER_STORE to the answer store to transcribe.")
+    connection = connect()
+    answers = dict(store.list_answers())
+    # Replaced or deleted answers would otherwise stay searchable and scored
+    removed = forget_removed(connection, answers)
+    done = indexed_versions(connection)
+    pending = [(key, version) for key, version in answers.items() if done.get(key) != version]
+    print(f"{len(pending)} answers to transcribe, {removed} removed answers forgotten")
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_load_model, initargs=(model_path,)) as pool:
+        futures = {pool.submit(transcribe_answer, key): (key, version) for key, version in pending}
+        for future in as_completed(futures):
+            key, version = futures[future]
+            try:
+                text = future.result()
+            except Exception as e:  # One bad video should not stop the batch
+                failed += 1
+                print(f"FAILED {key}: {e}", file=sys.stderr)
+                continue
+            save_transcript(connection, key, version, text)
+            print(f"ok {key}")
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Transcribe stored answers or search the transcripts.")
+    parser.add_argument("--model", help="path to an unpacked Vosk model")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--search", help="full-text query instead of transcribing")
+    args = parser.parse_args(argv)
+
+    if args.search:
+        for key, _, _, _, snippet in search(args.search):
+            print(f"{key}: {snippet}")
+        return 0
+    if not args.model:
+        parser.error("--model is required to transcribe")
+    return transcribe_all(args.model, args.workers)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""Pre-rendered question audio.
+
+Build the cache once, before starting the app:
+
+    python tts_cache.py
+
+Every question of every bank is rendered to MP3 with gTTS and stored under
+a name derived from a hash of its text, so an edited question gets a new
+file and unchanged questions are never rendered twice.
+"""
+import hashlib
+import os
+import sys
+
+from question_bank import list_sessions, load_questions
+
+# --- CONFIGURATION ---
+TTS_CACHE_DIR = os.environ.get(
+    "INTERVIEW_TTS_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "tts_cache"),
+)
+TTS_LANG = "en"
+TTS_TLD = "co.uk"
+
+
+def audio_cache_path(text, lang=TTS_LANG, tld=TTS_TLD):
+    """Returns where the audio for a question is (or would be) stored."""
+    digest = hashlib.sha256(f"{lang}|{tld}|{text}".encode("utf-8")).hexdigest()
+    return os.path.join(TTS_CACHE_DIR, f"{digest[:32]}.mp3")
+
+
+def cached_audio_path(text):
+    """Returns the rendered audio file for a question, or None if not built."""
+    path = audio_cache_path(text)
+    return path if os.path.exists(path) else None
+
+
+def render_audio(text):
+    """Renders one question with gTTS unless it is already cached."""
+    path = audio_cache_path(text)
+    if os.path.exists(path):
+        return path, False
+
+    from gtts import gTTS
+
+    os.makedirs(TTS_CACHE_DIR, exist_ok=True)
+    partial = path + ".part"
+    gTTS(text, lang=TTS_LANG, tld=TTS_TLD).save(partial)
+    os.replace(partial, path)
+    return path, True
+
+
+def build_cache():
+    """Renders every question of every bank into the cache."""
+    rendered = 0
+    total = 0
+    for session in list_sessions():
+        for question in load_questions(session):
+            total += 1
+            _, created = render_audio(question)
+            rendered += created
+    print(f"{total} questions, {rendered} newly rendered, cache at {TTS_CACHE_DIR}")
+
+
+if __name__ == "__main__":
+    sys.exit(build_cache())
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+
+# --- CONFIGURATION ---
+# Uploaded answers are copied here in small chunks so the app never keeps
+# whole videos in Python memory. Override with INTERVIEW_SPOOL_DIR.
+SPOOL_DIR = os.environ.get(
+    "INTERVIEW_SPOOL_DIR", os.path.join(tempfile.gettempdir(), "interview_spool")
+)
+
+# Maximum number of bytes a single interview session may keep on disk
+MAX_SESSION_BYTES = int(os.environ.get("INTERVIEW_MAX_SESSION_BYTES", 2 * 1024 ** 3))
+
+# Preview images made from answers (see thumbnails.py) sit next to them,
+# named qNN.<digest>-poster.jpg and so on, but do not count as answers
+PREVIEW_SUFFIXES = (".jpg", ".jpg.part", ".failed")
+
+# Size of each read when hashing a spooled file
+CHUNK_SIZE = 1024 * 1024
+
+# Per session: sha256 of each answer file -> its name, to spot re-uploads
+CONTENT_INDEX_FILE = "content_index.json"
+
+# Running hashes of recordings being received: recording path -> (sha256, bytes hashed)
+_recording_hashes = {}
+_hashes_lock = threading.Lock()
+
+
+class SpoolQuotaExceeded(Exception):
+    """Raised when a recording or upload would push a session over MAX_SESSION_BYTES."""
+
+
+class DuplicateAnswer(Exception):
+    """Raised when a finished upload has the same content as a spooled answer.
+
+    path is the answer file already holding that content; the new copy
+    has been discarded.
+    """
+
+    def __init__(self, path):
+        super().__init__(f"Same content as {os.path.basename(path)}")
+        self.path = path
+
+
+def new_spool_id():
+    """Returns a random identifier for a session's spool directory."""
+    return uuid.uuid4().hex
+
+
+def session_spool_dir(spool_id):
+    """Returns (and creates) the spool directory for one interview session."""
+    path = os.path.join(SPOOL_DIR, spool_id)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def session_spool_bytes(spool_id):
+    """Adds up the size of every spooled answer file of a session."""
+    total = 0
+    for entry in os.scandir(session_spool_dir(spool_id)):
+        # Answer files are named qNN.*; archives and preview images made
+        # from them do not count
+        if entry.is_file() and entry.name.startswith("q") and not entry.name.endswith(PREVIEW_SUFFIXES):
+            total += entry.stat().st_size
+    return total
+
+
+def _read_content_index(spool_dir):
+    try:
+        with open(os.path.join(spool_dir, CONTENT_INDEX_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_content_index(spool_dir, index):
+    path = os.path.join(spool_dir, CONTENT_INDEX_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    os.replace(path + ".tmp", path)
+
+
+def _install_answer(spool_id, q_index, partial, target, digest):
+    """Moves a finished file into place as the answer to a question.
+
+    Raises DuplicateAnswer instead if the session already holds an answer
+    with the same content (digest is the file's sha256).
+    """
+    spool_dir = session_spool_dir(spool_id)
+    index = _read_content_index(spool_dir)
+    existing = index.get(digest)
+    if existing and os.path.exists(os.path.join(spool_dir, existing)):
+        os.remove(partial)
+        raise DuplicateAnswer(os.path.join(spool_dir, existing))
+
+    # Remove earlier answers to the same question, whatever their extension
+    prefix = f"q{q_index + 1:02d}."
+    for entry in os.scandir(spool_dir):
+        if entry.name.startswith(prefix) and entry.path != partial:
+            os.remove(entry.path)
+    os.replace(partial, target)
+
+    index = {key: name for key, name in index.items() if not name.startswith(prefix)}
+    index[digest] = os.path.basename(target)
+    _write_content_index(spool_dir, index)
+    return target
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _recording_path(spool_id, q_index, recording_id):
+    return os.path.join(session_spool_dir(spool_id), f"q{q_index + 1:02d}.{recording_id}.rec")
+
+
+def append_recording_chunk(spool_id, q_index, recording_id, data):
+    """Appends one chunk of an in-browser recording to the spool."""
+    if session_spool_bytes(spool_id) + len(data) > MAX_SESSION_BYTES:
+        raise SpoolQuotaExceeded("This recording exceeds the storage allowed for one interview.")
+    path = _recording_path(spool_id, q_index, recording_id)
+    with open(path, "ab") as out:
+        out.write(data)
+    # Hash as the chunks arrive, so finishing needs no second read
+    with _hashes_lock:
+        digest, hashed = _recording_hashes.get(path) or (hashlib.sha256(), 0)
+        digest.update(data)
+        _recording_hashes[path] = (digest, hashed + len(data))
+
+
+def finish_recording(spool_id, q_index, recording_id, extension):
+    """Turns a completely received recording into the answer for a question."""
+    partial = _recording_path(spool_id, q_index, recording_id)
+    if not os.path.exists(partial):
+        # The recording stopped before any data arrived
+        open(partial, "wb").close()
+    with _hashes_lock:
+        digest, hashed = _recording_hashes.pop(partial, None) or (None, 0)
+    if digest is None or hashed != os.path.getsize(partial):
+        # Some chunks were received by another process, or before a restart
+        digest = _file_digest(partial)
+    else:
+        digest = digest.hexdigest()
+    target = os.path.join(session_spool_dir(spool_id), f"q{q_index + 1:02d}{extension}")
+    return _install_answer(spool_id, q_index, partial, target, digest)
+
+
+def clear_session_spool(spool_id):
+    """Deletes every spooled file of a session."""
+    spool_dir = os.path.join(SPOOL_DIR, spool_id)
+    with _hashes_lock:
+        for path in [p for p in _recording_hashes if os.path.dirname(p) == spool_dir]:
+            del _recording_hashes[path]
+    shutil.rmtree(spool_dir, ignore_errors=True)